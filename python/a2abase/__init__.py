@@ -1,4 +1,5 @@
 from .a2abase_client import A2ABaseClient
 from .agent import A2ABaseAgent
+from .store import LocalStore
 from .thread import A2ABaseThread
 from .tools import A2ABaseTools, MCPTools
@@ -1,15 +1,62 @@
+from typing import List, Optional
+
 from .api import agents, threads
+from .api.threads import Message
+from .api.circuit import CircuitBreakerRegistry
+from .api.concurrency import AdaptiveConcurrencyLimiter
+from .api.ratelimit import RateLimiter
+from .api.retry import RetryPolicy
+from .api.transport import PoolConfig, PoolStats, create_transport, get_pool_stats
 from .agent import A2ABaseAgent
+from .store import LocalStore
 from .thread import A2ABaseThread, Thread
 
 
 class A2ABaseClient:
-    def __init__(self, api_key: str, api_url: str = "https://a2abase.ai"):
-        self._agents_client = agents.create_agents_client(api_url, api_key)
-        self._threads_client = threads.create_threads_client(api_url, api_key)
+    def __init__(
+        self,
+        api_key: str,
+        api_url: str = "https://a2abase.ai",
+        pool: Optional[PoolConfig] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        thread_cache_ttl: float = 10.0,
+        agent_cache_ttl: float = 60.0,
+        store: Optional[LocalStore] = None,
+    ):
+        # One connection pool shared by the agents client, the threads client and agent-run streams
+        self._transport = create_transport(pool, retry, rate_limiter, concurrency_limiter, circuit_breakers)
+        self._agents_client = agents.create_agents_client(api_url, api_key, transport=self._transport, agent_cache_ttl=agent_cache_ttl)
+        self._threads_client = threads.create_threads_client(api_url, api_key, transport=self._transport, thread_cache_ttl=thread_cache_ttl)
+
+        self.Agent = A2ABaseAgent(self._agents_client, store=store)
+        self.Thread = A2ABaseThread(self._threads_client, store=store)
+        self.store = store
+
+    def pool_stats(self) -> PoolStats:
+        """Current state of the shared connection pool."""
+        return get_pool_stats(self._transport)
+
+    async def close(self):
+        """Close the shared connection pool."""
+        await self._transport.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def search(self, query: str, limit: int = 50) -> List[Message]:
+        """Full-text search over the locally mirrored history: message content, tool results and agent names.
 
-        self.Agent = A2ABaseAgent(self._agents_client)
-        self.Thread = A2ABaseThread(self._threads_client)
+        Only threads synced into the store are searched, see Thread.sync().
+        """
+        if self.store is None:
+            raise RuntimeError("search needs a local store, create the client with store=LocalStore(...)")
+        return self.store.search(query, limit=limit)
 
     async def new_thread(self, name: str | None = None) -> Thread:
         """Create a new thread."""
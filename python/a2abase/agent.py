@@ -1,16 +1,32 @@
+import asyncio
+import copy
+from datetime import datetime
+
 from .api.threads import AgentStartRequest
 from .thread import Thread, AgentRun
 from .tools import A2ABaseTools, MCPTools, A2ABaseTool
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, AsyncIterator, Iterable, Optional, List, Dict, Any
+from .api.pagination import iter_pages
 from .api.agents import (
     AgentCreateRequest,
     AgentPress_ToolConfig,
+    AgentResponse,
     AgentUpdateRequest,
     AgentsClient,
     CustomMCP,
     MCPConfig,
+    parse_timestamp,
 )
 
+if TYPE_CHECKING:
+    from .store import LocalStore
+
+
+def _updated_before(agent: AgentResponse, since: datetime) -> bool:
+    updated = parse_timestamp(agent.updated_at)
+    return updated is not None and updated < since
+
+
 class AgentNotFoundError(Exception):
     """Exception raised when an agent is not found."""
     pass
@@ -22,10 +38,13 @@ class Agent:
         client: AgentsClient,
         agent_id: str,
         model: str = "gemini/gemini-2.5-pro",
+        details: Optional[AgentResponse] = None,
     ):
         self._client = client
         self._agent_id = agent_id
         self._model = model
+        # Last details seen, e.g. a row of a list response; reads still go through the client's TTL cache
+        self._details = details
 
     async def update(
         self,
@@ -64,7 +83,8 @@ class Agent:
                         )
                     )
         else:
-            agent_details = await self.details()
+            # Served from the agent cache; copied because the tool configs are edited below
+            agent_details = copy.deepcopy(await self.details())
             agentpress_tools = agent_details.agentpress_tools
             custom_mcps = agent_details.custom_mcps
             if allowed_tools:
@@ -74,7 +94,7 @@ class Agent:
                 for mcp in custom_mcps:
                     mcp.enabled_tools = allowed_tools
 
-        await self._client.update_agent(
+        self._details = await self._client.update_agent(
             self._agent_id,
             AgentUpdateRequest(
                 name=name,
@@ -86,9 +106,16 @@ class Agent:
 
     
     async def get_details(self):
-        return await self._client.get_agent(self._agent_id)
+        # Served from the agent cache while the hydrated details are fresh, re-fetched once they expire
+        self._details = await self._client.get_agent(self._agent_id)
+        return self._details
     # Alias for backward compatibility and convenience
     details = get_details
+
+    async def refresh(self) -> AgentResponse:
+        """Re-fetch the agent details from the API."""
+        self._details = await self._client.get_agent(self._agent_id, refresh=True)
+        return self._details
     
     async def run(
         self,
@@ -111,8 +138,22 @@ class Agent:
 
 
 class A2ABaseAgent:
-    def __init__(self, client: AgentsClient):
+    # Page size used when walking the whole account to build the name index
+    INDEX_PAGE_SIZE = 100
+
+    def __init__(self, client: AgentsClient, store: Optional["LocalStore"] = None):
         self._client = client
+        self._index_lock = asyncio.Lock()
+        # Local mirror, agent names seen here are recorded so search can match them
+        self._store = store
+
+    def _record(self, agents: Iterable[AgentResponse]):
+        if self._store is not None:
+            self._store.upsert_agents(agents)
+
+    def _hydrate(self, agent: AgentResponse) -> Agent:
+        self._record([agent])
+        return Agent(self._client, agent.agent_id, details=agent)
 
     async def create(
         self,
@@ -161,29 +202,81 @@ class A2ABaseAgent:
             )
         )
 
-        return Agent(self._client, agent.agent_id)
+        return self._hydrate(agent)
 
     async def get_get_id(self, agent_id: str) -> Agent:
         agent = await self._client.get_agent(agent_id)
-        return Agent(self._client, agent.agent_id)
+        return self._hydrate(agent)
     
     async def list_agents(self, page: int = 1, limit: int = 20, search: Optional[str] = None) -> List[Agent]:
         """List agents with pagination and optional search."""
         resp = await self._client.get_agents(page=page, limit=limit, search=search)
-        return [Agent(self._client, a.agent_id) for a in resp.agents]
+        # The list rows are full agent details, no per-agent fetch needed
+        self._record(resp.agents)
+        return [Agent(self._client, a.agent_id, details=a) for a in resp.agents]
     
+    async def iter_all(self, page_size: int = 100, search: Optional[str] = None, prefetch: int = 1) -> AsyncIterator[Agent]:
+        """Iterate over every agent of the account, fetching the next page while the current one is consumed."""
+        async def fetch_page(page: int):
+            resp = await self._client.get_agents(page=page, limit=page_size, search=search)
+            # One store transaction per page rather than per agent
+            self._record(resp.agents)
+            return resp.agents, resp.pagination.pages
+
+        async for agent in iter_pages(fetch_page, prefetch=prefetch):
+            yield Agent(self._client, agent.agent_id, details=agent)
+
     # Alias for backward compatibility and convenience
     list = list_agents
     get = get_get_id
 
+    async def _sync_name_index(self, full: bool):
+        """Page through agents, newest update first, feeding the client's name index.
+
+        A full sync walks every page. An incremental sync stops at the first page
+        reaching agents older than anything indexed so far.
+        """
+        index = self._client.name_index
+        since = None if full else parse_timestamp(index.watermark)
+        page = 1
+        while True:
+            resp = await self._client.get_agents(page=page, limit=self.INDEX_PAGE_SIZE, sort_by="updated_at", sort_order="desc")
+            self._record(resp.agents)
+            if page == 1 and resp.agents and resp.agents[0].updated_at:
+                index.watermark = resp.agents[0].updated_at
+            if not resp.agents or page >= resp.pagination.pages:
+                break
+            if since is not None and any(_updated_before(a, since) for a in resp.agents):
+                break
+            page += 1
+        if full:
+            index.complete = True
+
+    async def refresh_name_index(self, full: bool = False):
+        """Pick up agents created, renamed or updated since the index was last synced.
+
+        Deletions made outside this client are only noticed by a full sync.
+        """
+        async with self._index_lock:
+            await self._sync_name_index(full=full or not self._client.name_index.complete)
+
+    async def _ensure_name_index(self):
+        async with self._index_lock:
+            if not self._client.name_index.complete:
+                await self._sync_name_index(full=True)
+
     async def find_by_name(self, name: str) -> Agent:
         try:
-            resp = await self._client.get_agents(page=1, limit=100, search=name)
-            # First try exact match from search results
-            for a in resp.agents:
-                if a.name == name:
-                    return Agent(self._client, a.agent_id)
-            raise AgentNotFoundError(f"Agent with name '{name}' not found")
+            index = self._client.name_index
+            await self._ensure_name_index()
+            agent = index.lookup(name)
+            if agent is None:
+                # Maybe created since the last sync
+                await self.refresh_name_index()
+                agent = index.lookup(name)
+            if agent is None:
+                raise AgentNotFoundError(f"Agent with name '{name}' not found")
+            return Agent(self._client, agent.agent_id, details=agent)
         except AgentNotFoundError:
             raise
         except Exception as e:
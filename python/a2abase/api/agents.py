@@ -1,10 +1,22 @@
 # Re-implemented via local a2astudio tools/types
 from dataclasses import dataclass, asdict
-from typing import Optional, List, Dict, Any
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, AsyncIterator
 import httpx
 import json
+import re
 
 from ..tools import A2ABaseTools
+from . import codec
+from .circuit import CircuitBreakerRegistry
+from .concurrency import AdaptiveConcurrencyLimiter
+from .ratelimit import RateLimiter
+from .cache import TTLCache
+from .intern import INTERNED_FIELDS, intern_id
+from .jsonstream import iter_json_array
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .transport import PoolConfig, create_transport
 
 
 @dataclass
@@ -73,7 +85,7 @@ class AgentVersionResponse:
     created_by: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponse:
     agent_id: str
     name: str
@@ -188,20 +200,116 @@ def from_dict(cls, data: Dict[str, Any]):
                 except (ValueError, KeyError):
                     # Skip invalid tool keys
                     pass
-        agent_data = {k: v for k, v in data.items() if k not in ["current_version", "custom_mcps", "agentpress_tools"]}
+        agent_data = {
+            k: intern_id(v) if k in INTERNED_FIELDS else v
+            for k, v in data.items()
+            if k not in ["current_version", "custom_mcps", "agentpress_tools"]
+        }
         agent_data["current_version"] = current_version
         agent_data["custom_mcps"] = custom_mcps
         agent_data["agentpress_tools"] = agentpress_tools
         agent_data["tags"] = agent_data.get("tags", [])
         return cls(**{k: v for k, v in agent_data.items() if k in cls.__dataclass_fields__})
     if hasattr(cls, "__dataclass_fields__"):
-        filtered = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        filtered = {k: intern_id(v) if k in INTERNED_FIELDS else v for k, v in data.items() if k in cls.__dataclass_fields__}
         return cls(**filtered)
     return data
 
 
+_EXCESS_FRACTION = re.compile(r"(\.\d{6})\d+")
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp from the API, None when missing or malformed.
+
+    Timestamps without an offset are taken as UTC, so differently formatted
+    timestamps of the same instant compare equal.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    # Postgres may send more than the 6 fractional digits datetime keeps
+    value = _EXCESS_FRACTION.sub(r"\1", value)
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _is_older(agent: AgentResponse, cached: AgentResponse) -> bool:
+    """Whether ``agent`` is an earlier version of the agent than ``cached``.
+
+    Decided by updated_at when both carry one, otherwise by the version they
+    point at: the same current_version_id is the same version, a different one
+    is older when it belongs to fewer versions. When neither tells, the agent at
+    hand is taken as the newer.
+    """
+    agent_updated, cached_updated = parse_timestamp(agent.updated_at), parse_timestamp(cached.updated_at)
+    if agent_updated is not None and cached_updated is not None:
+        return agent_updated < cached_updated
+    if agent.current_version_id is None or agent.current_version_id == cached.current_version_id:
+        return False
+    if agent.current_version is not None and cached.current_version is not None:
+        return agent.current_version.version_number < cached.current_version.version_number
+    if agent.version_count is not None and cached.version_count is not None:
+        return agent.version_count < cached.version_count
+    return False
+
+
+_NEVER = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _updated_key(agent: AgentResponse) -> datetime:
+    return parse_timestamp(agent.updated_at) or _NEVER
+
+
+class AgentNameIndex:
+    """Agents by name, for O(1) lookups. Several agents may share a name, the most
+    recently updated one wins."""
+
+    def __init__(self):
+        self._by_name: Dict[str, Dict[str, AgentResponse]] = {}
+        self._name_of: Dict[str, str] = {}
+        # Newest updated_at seen by the last sync, the next incremental sync stops once it pages past it
+        self.watermark: Optional[str] = None
+        # Set once a full pagination of the account has been indexed
+        self.complete = False
+
+    def add(self, agent: AgentResponse):
+        previous_name = self._name_of.get(agent.agent_id)
+        if previous_name is not None and previous_name != agent.name:
+            self.remove(agent.agent_id)
+        self._by_name.setdefault(agent.name, {})[agent.agent_id] = agent
+        self._name_of[agent.agent_id] = agent.name
+
+    def remove(self, agent_id: str):
+        name = self._name_of.pop(agent_id, None)
+        if name is None:
+            return
+        agents = self._by_name.get(name, {})
+        agents.pop(agent_id, None)
+        if not agents:
+            self._by_name.pop(name, None)
+
+    def lookup(self, name: str) -> Optional[AgentResponse]:
+        agents = self._by_name.get(name)
+        if not agents:
+            return None
+        if len(agents) == 1:
+            return next(iter(agents.values()))
+        return max(agents.values(), key=_updated_key)
+
+    def __len__(self) -> int:
+        return len(self._name_of)
+
+
 class AgentsClient:
-    def __init__(self, base_url: str, auth_token: Optional[str] = None, custom_headers: Optional[Dict[str, str]] = None, timeout: float = 30.0):
+    def __init__(self, base_url: str, auth_token: Optional[str] = None, custom_headers: Optional[Dict[str, str]] = None, timeout: float = 30.0, transport: Optional[httpx.AsyncBaseTransport] = None, pool: Optional[PoolConfig] = None, retry: Optional[RetryPolicy] = None, rate_limiter: Optional[RateLimiter] = None, concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None, circuit_breakers: Optional[CircuitBreakerRegistry] = None, agent_cache_ttl: float = 60.0):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         default_headers = {"Content-Type": "application/json", "Accept": "application/json"}
@@ -209,10 +317,18 @@ class AgentsClient:
             default_headers["X-API-Key"] = auth_token
         if custom_headers:
             default_headers.update(custom_headers)
-        self.client = httpx.AsyncClient(headers=default_headers, timeout=timeout, base_url=self.base_url)
+        # A transport passed in is shared with other clients and closed by its owner
+        self._owns_transport = transport is None
+        self.transport = transport or create_transport(pool, retry, rate_limiter, concurrency_limiter, circuit_breakers)
+        self.client = httpx.AsyncClient(headers=default_headers, timeout=timeout, base_url=self.base_url, transport=self.transport)
+        self._single_flight = SingleFlight()
+        # Agent details by agent_id, kept current from every response that carries an agent
+        self.agent_cache: TTLCache[AgentResponse] = TTLCache(agent_cache_ttl)
+        self.name_index = AgentNameIndex()
 
     async def close(self):
-        await self.client.aclose()
+        if self._owns_transport:
+            await self.client.aclose()
 
     async def __aenter__(self):
         return self
@@ -223,36 +339,85 @@ class AgentsClient:
     def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
         if response.status_code >= 400:
             try:
-                detail = response.json().get("detail", f"HTTP {response.status_code}")
+                detail = codec.loads(response.content).get("detail", f"HTTP {response.status_code}")
             except:
                 detail = f"HTTP {response.status_code}"
             raise httpx.HTTPStatusError(f"API request failed: {detail}", request=response.request, response=response)
-        return response.json()
+        return codec.loads(response.content)
+
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET and decode, sharing one in-flight request between identical concurrent calls."""
+        async def fetch():
+            return self._handle_response(await self.client.get(path, params=params))
+        return await self._single_flight.do(("GET", str(httpx.URL(path, params=params))), fetch)
+
+    def _remember(self, agent: AgentResponse) -> AgentResponse:
+        """Cache and index an agent unless the cache already holds a newer version of it."""
+        cached = self.agent_cache.get(agent.agent_id)
+        if cached is not None and _is_older(agent, cached):
+            # A response that left the server before the cached one, e.g. a list racing an update
+            return cached
+        self.agent_cache.set(agent.agent_id, agent)
+        self.name_index.add(agent)
+        return agent
 
     async def get_agents(self, page: int = 1, limit: int = 20, search: Optional[str] = None, sort_by: str = "created_at", sort_order: str = "desc") -> AgentsResponse:
         params = {"page": page, "limit": limit, "sort_by": sort_by, "sort_order": sort_order}
         if search:
             params["search"] = search
-        data = self._handle_response(await self.client.get("/agents", params=params))
-        return from_dict(AgentsResponse, data)
+        data = await self._get("/agents", params=params)
+        response = from_dict(AgentsResponse, data)
+        for agent in response.agents:
+            self._remember(agent)
+        return response
+
+    async def stream_agents(self, page: int = 1, limit: int = 20, search: Optional[str] = None, sort_by: str = "created_at", sort_order: str = "desc", fields: Optional[Dict[str, Any]] = None) -> AsyncIterator[AgentResponse]:
+        """Like get_agents, but yields agents while the page downloads instead of holding it all in memory.
 
-    async def get_agent(self, agent_id: str) -> AgentResponse:
-        data = self._handle_response(await self.client.get(f"/agents/{agent_id}"))
-        return from_dict(AgentResponse, data)
+        Pass a dict as ``fields`` to get the raw ``pagination`` member once the last agent has been yielded.
+        """
+        params = {"page": page, "limit": limit, "sort_by": sort_by, "sort_order": sort_order}
+        if search:
+            params["search"] = search
+        async with self.client.stream("GET", "/agents", params=params) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                self._handle_response(response)
+            async for data in iter_json_array(response.aiter_bytes(), "agents", fields):
+                yield self._remember(from_dict(AgentResponse, data))
+
+    async def get_agent(self, agent_id: str, refresh: bool = False) -> AgentResponse:
+        if not refresh:
+            agent = self.agent_cache.get(agent_id)
+            if agent is not None:
+                return agent
+        data = await self._get(f"/agents/{agent_id}")
+        return self._remember(from_dict(AgentResponse, data))
 
     async def create_agent(self, request: AgentCreateRequest) -> AgentResponse:
-        data = self._handle_response(await self.client.post("/agents", json=to_dict(request)))
-        return from_dict(AgentResponse, data)
+        data = self._handle_response(await self.client.post("/agents", **codec.json_body(to_dict(request))))
+        return self._remember(from_dict(AgentResponse, data))
 
     async def update_agent(self, agent_id: str, request: AgentUpdateRequest) -> AgentResponse:
-        data = self._handle_response(await self.client.put(f"/agents/{agent_id}", json=to_dict(request)))
-        return from_dict(AgentResponse, data)
+        response = await self.client.put(f"/agents/{agent_id}", **codec.json_body(to_dict(request)))
+        if response.status_code >= 400:
+            # The update may or may not have been applied
+            self.agent_cache.invalidate(agent_id)
+        data = self._handle_response(response)
+        agent = from_dict(AgentResponse, data)
+        # The PUT response is the new version, it replaces the cached one outright
+        self.agent_cache.set(agent_id, agent)
+        self.name_index.add(agent)
+        return agent
 
     async def delete_agent(self, agent_id: str) -> DeleteAgentResponse:
-        data = self._handle_response(await self.client.delete(f"/agents/{agent_id}"))
+        response = await self.client.delete(f"/agents/{agent_id}")
+        self.agent_cache.invalidate(agent_id)
+        data = self._handle_response(response)
+        self.name_index.remove(agent_id)
         return DeleteAgentResponse(message=data.get("message", "ok"))
 
 
-def create_agents_client(base_url: str, auth_token: Optional[str] = None, custom_headers: Optional[Dict[str, str]] = None, timeout: float = 30.0) -> AgentsClient:
-    return AgentsClient(base_url=base_url, auth_token=auth_token, custom_headers=custom_headers, timeout=timeout)
+def create_agents_client(base_url: str, auth_token: Optional[str] = None, custom_headers: Optional[Dict[str, str]] = None, timeout: float = 30.0, transport: Optional[httpx.AsyncBaseTransport] = None, pool: Optional[PoolConfig] = None, retry: Optional[RetryPolicy] = None, rate_limiter: Optional[RateLimiter] = None, concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None, circuit_breakers: Optional[CircuitBreakerRegistry] = None, agent_cache_ttl: float = 60.0) -> AgentsClient:
+    return AgentsClient(base_url=base_url, auth_token=auth_token, custom_headers=custom_headers, timeout=timeout, transport=transport, pool=pool, retry=retry, rate_limiter=rate_limiter, concurrency_limiter=concurrency_limiter, circuit_breakers=circuit_breakers, agent_cache_ttl=agent_cache_ttl)
 
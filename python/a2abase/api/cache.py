@@ -0,0 +1,51 @@
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+import time
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Small in-memory cache whose entries expire ``ttl`` seconds after being stored.
+
+    A ``ttl`` of 0 disables caching. Beyond ``max_entries`` the oldest entries are dropped.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, V]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: V):
+        if not self.enabled:
+            return
+        # Re-insert so dict order stays oldest-first for eviction
+        self._entries.pop(key, None)
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key) is not None
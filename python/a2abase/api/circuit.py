@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+import time
+import httpx
+
+from .routes import Route
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitEvent:
+    """Emitted whenever a route's circuit changes state."""
+    route: str
+    previous: CircuitState
+    state: CircuitState
+    consecutive_failures: int
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised without sending the request while the route's circuit is open.
+
+    Not a TransportError: reconnect and retry loops catching those must fail fast
+    here rather than keep knocking on a backend considered down.
+    """
+
+    def __init__(self, route: str, retry_in: float, request: Optional[httpx.Request] = None):
+        super().__init__(f"Circuit open for {route}, retry in {retry_in:.1f}s")
+        if request is not None:
+            self.request = request
+        self.route = route
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failure_threshold`` consecutive failures, open -> half-open
+    after ``recovery_timeout`` seconds, then ``half_open_max_calls`` probes decide
+    between closed and open again."""
+
+    def __init__(
+        self,
+        route: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        listeners: Optional[List[Callable[[CircuitEvent], None]]] = None,
+    ):
+        self.route = route
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.listeners = listeners if listeners is not None else []
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+
+    def before_request(self, request: Optional[httpx.Request] = None):
+        """Let the request through or raise CircuitOpenError."""
+        if self.state == CircuitState.OPEN:
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(self.route, remaining, request=request)
+            self._transition(CircuitState.HALF_OPEN)
+        if self.state == CircuitState.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                raise CircuitOpenError(self.route, 0.0, request=request)
+            self._half_open_calls += 1
+
+    def on_success(self):
+        self.consecutive_failures = 0
+        if self.state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+
+    def on_failure(self):
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            if self.state != CircuitState.OPEN:
+                self._transition(CircuitState.OPEN)
+
+    def on_abandoned(self):
+        """The request ended without an outcome (e.g. cancelled), free its probe slot."""
+        if self.state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def _transition(self, state: CircuitState):
+        previous, self.state = self.state, state
+        self._half_open_calls = 0
+        event = CircuitEvent(self.route, previous, state, self.consecutive_failures)
+        for listener in self.listeners:
+            listener(event)
+
+
+class CircuitBreakerRegistry:
+    """One circuit breaker per route template, created on first use."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        listeners: Optional[List[Callable[[CircuitEvent], None]]] = None,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.listeners = listeners if listeners is not None else []
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def add_listener(self, listener: Callable[[CircuitEvent], None]):
+        self.listeners.append(listener)
+
+    def breaker_for(self, route: Route) -> CircuitBreaker:
+        breaker = self._breakers.get(route.key)
+        if breaker is None:
+            breaker = self._breakers[route.key] = CircuitBreaker(
+                route.key,
+                failure_threshold=self.failure_threshold,
+                recovery_timeout=self.recovery_timeout,
+                half_open_max_calls=self.half_open_max_calls,
+                # Shared list, so listeners added later reach existing breakers too
+                listeners=self.listeners,
+            )
+        return breaker
+
+    def states(self) -> Dict[str, CircuitState]:
+        return {key: breaker.state for key, breaker in self._breakers.items()}
@@ -0,0 +1,133 @@
+from typing import Any, Callable, Optional, Union
+import json
+import re
+
+# Decoders raise json.JSONDecodeError whatever the backend, so callers only catch one error type
+DecodeError = json.JSONDecodeError
+
+JSON_CONTENT_TYPE = "application/json"
+
+_stdlib_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class JSONCodec:
+    """JSON encoder/decoder pair used for request bodies, responses and stream lines."""
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        return json.loads(data)
+
+    def loads_from(self, data: str, start: int) -> Any:
+        """Decode ``data[start:]`` as json.loads would, without copying it first.
+
+        Whitespace around the value is allowed, anything else after it is not.
+        """
+        start = _WHITESPACE.match(data, start).end()
+        value, end = _stdlib_decoder.raw_decode(data, start)
+        end = _WHITESPACE.match(data, end).end()
+        if end != len(data):
+            raise DecodeError("Extra data", data, end)
+        return value
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        # Enum keys, e.g. A2ABaseTools in agentpress_tools, are not plain str
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._options)
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        # orjson.JSONDecodeError already subclasses json.JSONDecodeError
+        return self._orjson.loads(data)
+
+    def loads_from(self, data: str, start: int) -> Any:
+        # Slicing is cheap next to the decode the C backends save
+        return self._orjson.loads(data[start:])
+
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._decode_error = msgspec.DecodeError
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as e:
+            raise DecodeError(str(e), data if isinstance(data, str) else "", 0) from e
+
+    def loads_from(self, data: str, start: int) -> Any:
+        return self.loads(data[start:])
+
+
+# Fastest first
+_BACKENDS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+
+_codec: JSONCodec = JSONCodec()
+
+# Bound to the active codec's methods, call them through the module (``codec.loads``)
+# so a later use_codec() is picked up
+dumps: Callable[[Any], bytes] = _codec.dumps
+loads: Callable[[Union[str, bytes, bytearray, memoryview]], Any] = _codec.loads
+loads_from: Callable[[str, int], Any] = _codec.loads_from
+
+
+def use_codec(codec: Optional[Union[str, JSONCodec]] = None) -> JSONCodec:
+    """Select the JSON backend used by the SDK and return it.
+
+    ``codec`` is a backend name ("orjson", "msgspec", "json") or a JSONCodec
+    instance. When omitted the fastest installed backend is picked.
+    """
+    global _codec, dumps, loads, loads_from
+    if codec is None:
+        for factory in _BACKENDS.values():
+            try:
+                codec = factory()
+                break
+            except ImportError:
+                continue
+    elif isinstance(codec, str):
+        if codec not in _BACKENDS:
+            raise ValueError(f"Unknown JSON codec {codec!r}, expected one of {', '.join(_BACKENDS)}")
+        codec = _BACKENDS[codec]()
+    _codec = codec
+    dumps = codec.dumps
+    loads = codec.loads
+    loads_from = codec.loads_from
+    return codec
+
+
+def get_codec() -> JSONCodec:
+    return _codec
+
+
+def json_body(obj: Any) -> dict:
+    """Keyword arguments for an httpx request carrying ``obj`` as a JSON body."""
+    return {"content": dumps(obj), "headers": {"Content-Type": JSON_CONTENT_TYPE}}
+
+
+use_codec()
@@ -0,0 +1,102 @@
+from typing import Deque, FrozenSet, Optional
+from collections import deque
+import asyncio
+
+from .routes import Route
+
+
+# Calls that start work on the server: these are what overloads it
+DEFAULT_LIMITED_ROUTES = frozenset({
+    "POST /thread/{thread_id}/agent/start",
+    "POST /threads/{thread_id}/messages/add",
+    "GET /agent-run/{agent_run_id}/stream",
+})
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight requests, after Netflix's concurrency-limits.
+
+    The limit grows by one per limit's worth of successful requests while latency
+    stays within ``latency_tolerance`` times the baseline, and is cut by
+    ``backoff_ratio`` on timeouts, 429/503 responses and latency spikes. Requests over the
+    limit wait in FIFO order. For stream opens the slot is held until the
+    response headers arrive.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.9,
+        latency_tolerance: float = 2.0,
+        routes: Optional[FrozenSet[str]] = DEFAULT_LIMITED_ROUTES,
+    ):
+        self._limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        # None limits every route
+        self.routes = routes
+        self.baseline_latency: Optional[float] = None
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def applies_to(self, route: Route) -> bool:
+        return self.routes is None or route.key in self.routes
+
+    async def acquire(self):
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just as we were cancelled, pass it on
+                self._in_flight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: Optional[float], dropped: bool = False):
+        """Return a slot. ``dropped`` marks a timeout, 429 or 503, ``latency`` is seconds to response."""
+        self._in_flight -= 1
+        if dropped:
+            self._decrease()
+        elif latency is not None:
+            if self.baseline_latency is None:
+                self.baseline_latency = latency
+            if latency > self.baseline_latency * self.latency_tolerance:
+                self._decrease()
+            else:
+                # Slow-moving average so a gradual drift is followed but a spike is not absorbed
+                self.baseline_latency = 0.95 * self.baseline_latency + 0.05 * latency
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+        self._wake()
+
+    def _decrease(self):
+        self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+
+    def _wake(self):
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
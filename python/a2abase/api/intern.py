@@ -0,0 +1,39 @@
+from typing import Dict, Optional
+
+
+class InternTable:
+    """Bounded string intern table.
+
+    Returns one shared copy of each value seen, so identifiers repeated across
+    many decoded messages (thread and agent ids, message types) are stored once.
+    Unlike ``sys.intern`` the table is bounded: beyond ``max_entries`` the oldest
+    values are dropped, so a long-running process does not pin every id it ever saw.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._values: Dict[str, str] = {}
+
+    def __call__(self, value: Optional[str]) -> Optional[str]:
+        if value.__class__ is not str:
+            return value
+        shared = self._values.get(value)
+        if shared is not None:
+            return shared
+        if len(self._values) >= self.max_entries:
+            del self._values[next(iter(self._values))]
+        self._values[value] = value
+        return value
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def clear(self):
+        self._values.clear()
+
+
+# Shared by the stream parser, the from_dict helpers and the local store
+intern_id = InternTable()
+
+# Fields holding repeated identifiers or enum-like values
+INTERNED_FIELDS = frozenset({"thread_id", "agent_id", "agent_version_id", "thread_run_id", "type", "project_id", "account_id"})
@@ -0,0 +1,224 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import json
+import re
+
+from . import codec
+
+_STRUCTURE = re.compile(rb'["\[\]{}]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb"[,\]}\s]")
+_NOT_WHITESPACE = re.compile(rb"\S")
+
+
+class _ValueScanner:
+    """Finds where one JSON value ends, resumable when the value spans several chunks."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.kind: Optional[str] = None  # "container", "string" or "scalar"
+        self.depth = 0
+        self.in_string = False
+
+    def scan(self, buf: bytearray, pos: int) -> Tuple[Optional[int], int]:
+        """Scan from ``pos``. Returns (end, resume_at): ``end`` is the index just past
+        the value, or None when more data is needed and scanning resumes at ``resume_at``."""
+        if self.kind is None:
+            c = buf[pos]
+            if c in b"[{":
+                self.kind, self.depth = "container", 1
+                pos += 1
+            elif c == 0x22:
+                self.kind, self.in_string = "string", True
+                pos += 1
+            else:
+                self.kind = "scalar"
+        while True:
+            if self.in_string:
+                m = _STRING_SPECIAL.search(buf, pos)
+                if m is None:
+                    return None, len(buf)
+                i = m.start()
+                if buf[i] == 0x5C:
+                    if i + 1 >= len(buf):
+                        return None, i
+                    pos = i + 2
+                    continue
+                self.in_string = False
+                pos = i + 1
+                if self.kind == "string":
+                    return pos, pos
+                continue
+            if self.kind == "scalar":
+                # Values inside an object are always followed by a delimiter
+                m = _SCALAR_END.search(buf, pos)
+                if m is None:
+                    return None, len(buf)
+                return m.start(), m.start()
+            m = _STRUCTURE.search(buf, pos)
+            if m is None:
+                return None, len(buf)
+            i = m.start()
+            c = buf[i]
+            if c == 0x22:
+                self.in_string = True
+            elif c in b"[{":
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1, i + 1
+            pos = i + 1
+
+
+# Parser states
+_OBJECT_START, _KEY, _COLON, _VALUE, _AFTER_VALUE, _ARRAY_START, _ELEMENT, _AFTER_ELEMENT, _DONE = range(9)
+
+
+class JSONArrayStream:
+    """Incremental decoder for a JSON object holding one large array, e.g. ``{"threads": [...], "pagination": {...}}``.
+
+    Bytes are fed as they arrive and the elements of the ``key`` array come out
+    one by one, so memory is bounded by the largest element rather than by the
+    whole body. The object's other members are decoded into ``fields``.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self.fields: Dict[str, Any] = {}
+        self._buf = bytearray()
+        self._pos = 0
+        self._state = _OBJECT_START
+        self._scanner = _ValueScanner()
+        self._value_start: Optional[int] = None
+        self._scan_at = 0
+        self._current_key: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add bytes and return the array elements completed by them."""
+        self._buf += chunk
+        elements: List[Any] = []
+        while self._step(elements):
+            pass
+        # Drop everything already consumed so the buffer only holds the value in progress
+        start = self._pos if self._value_start is None else self._value_start
+        if start:
+            del self._buf[:start]
+            self._pos -= start
+            self._scan_at -= start
+            if self._value_start is not None:
+                self._value_start = 0
+        return elements
+
+    def _skip_whitespace(self) -> bool:
+        m = _NOT_WHITESPACE.search(self._buf, self._pos)
+        if m is None:
+            self._pos = len(self._buf)
+            return False
+        self._pos = m.start()
+        return True
+
+    def _expect(self, char: bytes):
+        if self._buf[self._pos:self._pos + 1] != char:
+            found = bytes(self._buf[self._pos:self._pos + 20])
+            raise json.JSONDecodeError(f"Expected {char.decode()!r}, found {found!r}", found.decode(errors="replace"), 0)
+        self._pos += 1
+
+    def _scan_value(self) -> Optional[bytes]:
+        """Continue scanning the current value, returning its bytes once complete."""
+        if self._value_start is None:
+            self._value_start = self._scan_at = self._pos
+            self._scanner.reset()
+        end, self._scan_at = self._scanner.scan(self._buf, self._scan_at)
+        if end is None:
+            return None
+        raw = bytes(self._buf[self._value_start:end])
+        self._pos = end
+        self._value_start = None
+        return raw
+
+    def _step(self, elements: List[Any]) -> bool:
+        """Advance the parser by one token. Returns False when more data is needed."""
+        state = self._state
+        if state == _DONE:
+            return False
+        if self._value_start is None and not self._skip_whitespace():
+            return False
+        if state == _OBJECT_START:
+            self._expect(b"{")
+            self._state = _KEY
+        elif state == _KEY:
+            if self._value_start is None and self._buf[self._pos] == 0x7D:
+                self._pos += 1
+                self._state = _DONE
+                return False
+            raw = self._scan_value()
+            if raw is None:
+                return False
+            self._current_key = codec.loads(raw)
+            self._state = _COLON
+        elif state == _COLON:
+            self._expect(b":")
+            if self._current_key == self.key:
+                self._state = _ARRAY_START
+            else:
+                self._state = _VALUE
+        elif state == _VALUE:
+            raw = self._scan_value()
+            if raw is None:
+                return False
+            self.fields[self._current_key] = codec.loads(raw)
+            self._state = _AFTER_VALUE
+        elif state == _AFTER_VALUE:
+            if self._buf[self._pos] == 0x7D:
+                self._pos += 1
+                self._state = _DONE
+                return False
+            self._expect(b",")
+            self._state = _KEY
+        elif state == _ARRAY_START:
+            if self._buf[self._pos] != 0x5B:
+                # Not an array after all (e.g. null), keep it as a plain field
+                self._state = _VALUE
+                return True
+            self._pos += 1
+            self._state = _ELEMENT
+        elif state == _ELEMENT:
+            if self._value_start is None and self._buf[self._pos] == 0x5D:
+                # Empty array
+                self._pos += 1
+                self._state = _AFTER_VALUE
+                return True
+            raw = self._scan_value()
+            if raw is None:
+                return False
+            elements.append(codec.loads(raw))
+            self._state = _AFTER_ELEMENT
+        elif state == _AFTER_ELEMENT:
+            if self._buf[self._pos] == 0x5D:
+                self._pos += 1
+                self._state = _AFTER_VALUE
+            else:
+                self._expect(b",")
+                self._state = _ELEMENT
+        return True
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes], key: str, fields: Optional[Dict[str, Any]] = None) -> AsyncIterator[Any]:
+    """Yield the decoded elements of the ``key`` array from a stream of JSON body chunks.
+
+    When ``fields`` is given it receives the object's other members (e.g. ``pagination``).
+    """
+    parser = JSONArrayStream(key)
+    async for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+    if not parser.done:
+        raise json.JSONDecodeError("Unexpected end of JSON body", "", 0)
+    if fields is not None:
+        fields.update(parser.fields)
@@ -0,0 +1,52 @@
+from typing import AsyncIterator, Awaitable, Callable, List, Tuple, TypeVar
+import asyncio
+
+T = TypeVar("T")
+
+# fetch_page(page) -> (items on that page, total number of pages)
+PageFetcher = Callable[[int], Awaitable[Tuple[List[T], int]]]
+
+_DONE = object()
+
+
+async def iter_pages(fetch_page: PageFetcher, prefetch: int = 1) -> AsyncIterator[T]:
+    """Yield every item of a paginated listing, starting at page 1.
+
+    A background task fetches up to ``prefetch`` pages ahead of the consumer, so
+    the request for page N+1 overlaps with processing page N while memory stays
+    bounded to ``prefetch + 1`` pages.
+    """
+    pages: asyncio.Queue = asyncio.Queue(maxsize=max(prefetch, 1))
+
+    async def produce():
+        page = 1
+        try:
+            while True:
+                items, total_pages = await fetch_page(page)
+                if items:
+                    await pages.put(items)
+                if not items or page >= total_pages:
+                    break
+                page += 1
+        except Exception as e:
+            await pages.put(e)
+        else:
+            await pages.put(_DONE)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            items = await pages.get()
+            if items is _DONE:
+                return
+            if isinstance(items, Exception):
+                raise items
+            for item in items:
+                yield item
+    finally:
+        # The consumer may stop early, do not leave the prefetch running
+        producer.cancel()
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
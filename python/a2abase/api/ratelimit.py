@@ -0,0 +1,117 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+import asyncio
+import time
+
+from .routes import Route
+
+
+@dataclass
+class RateLimit:
+    """Sustained requests per second and the burst allowed on top of it."""
+    rate: float
+    burst: float = 1.0
+
+
+class TokenBucket:
+    """Token bucket whose refill rate backs off on 429 and creeps back up on success."""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        min_rate: Optional[float] = None,
+        decrease_factor: float = 0.5,
+        increase_step: Optional[float] = None,
+    ):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.decrease_factor = decrease_factor
+        # Recover the full rate after roughly 20 successful requests
+        self.increase_step = increase_step if increase_step is not None else rate / 20
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        # The lock queues waiters so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+    def on_throttled(self, retry_after: Optional[float] = None):
+        """The server answered 429: slow down, and hold off entirely for Retry-After."""
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+    def on_success(self):
+        if self.rate < self.max_rate:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.increase_step)
+
+
+class RateLimiter:
+    """Client-side rate limits shared by every request sent through one transport.
+
+    Buckets are looked up by route key (``"POST /thread/{thread_id}/agent/start"``),
+    then by method (``"GET"``), then fall back to ``default``. Requests resolving to
+    the same entry share a bucket. Without a default, unmatched requests are not limited.
+    """
+
+    def __init__(self, default: Optional[RateLimit] = None, routes: Optional[Dict[str, RateLimit]] = None, adaptive: bool = True):
+        self.default = default
+        self.routes = dict(routes or {})
+        self.adaptive = adaptive
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket_for(self, route: Route) -> Optional[TokenBucket]:
+        for key in (route.key, route.method):
+            if key in self.routes:
+                return self._bucket(key, self.routes[key])
+        if self.default is not None:
+            return self._bucket("*", self.default)
+        return None
+
+    def _bucket(self, key: str, limit: RateLimit) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(limit.rate, limit.burst)
+        return bucket
+
+    async def acquire(self, route: Route):
+        bucket = self.bucket_for(route)
+        if bucket is not None:
+            await bucket.acquire()
+
+    def on_response(self, route: Route, status_code: int, retry_after: Optional[float] = None):
+        if not self.adaptive:
+            return
+        bucket = self.bucket_for(route)
+        if bucket is None:
+            return
+        if status_code == 429:
+            bucket.on_throttled(retry_after)
+        elif status_code < 500:
+            bucket.on_success()
+
+    def current_rates(self) -> Dict[str, float]:
+        return {key: bucket.rate for key, bucket in self._buckets.items()}
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import FrozenSet, Optional
+import random
+import httpx
+
+from .routes import Route
+
+
+# Failures where the request never reached the server, safe to resend for any method
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Failures where the server may or may not have processed the request
+_TRANSIENT_ERRORS = _NOT_SENT_ERRORS + (httpx.ReadError, httpx.ReadTimeout, httpx.WriteError, httpx.RemoteProtocolError)
+
+
+class RetryBudget:
+    """Caps retries to a fraction of traffic so retries cannot amplify an outage.
+
+    Every first attempt deposits ``ratio`` tokens and every retry spends one, so
+    in steady state at most ``ratio`` retries are sent per request. ``min_tokens``
+    lets low-traffic clients retry at all.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.max_tokens = max(max_tokens, min_tokens)
+        self.tokens = min_tokens
+
+    def deposit(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before resending a failed request."""
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 10.0
+    retry_statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    respect_retry_after: bool = True
+    # Retry-After values beyond this are not waited for, the response is returned as is
+    max_retry_after: float = 60.0
+    budget: Optional[RetryBudget] = field(default_factory=RetryBudget)
+
+    def should_retry_response(self, route: Route, response: httpx.Response) -> bool:
+        if response.status_code not in self.retry_statuses:
+            return False
+        # A 429 is rejected before processing, resending is safe whatever the method
+        return route.idempotent or response.status_code == 429
+
+    def should_retry_error(self, route: Route, error: Exception) -> bool:
+        if isinstance(error, _NOT_SENT_ERRORS):
+            return True
+        return route.idempotent and isinstance(error, _TRANSIENT_ERRORS)
+
+    def backoff(self, previous_delay: float) -> float:
+        """Decorrelated jitter: random between the base delay and three times the previous one."""
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Seconds the server asked us to wait, None if it did not say."""
+        if not self.respect_retry_after:
+            return None
+        return parse_retry_after(response.headers.get("Retry-After"))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as delay-seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
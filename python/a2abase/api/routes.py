@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from typing import List, Pattern
+import re
+
+
+@dataclass(frozen=True)
+class Route:
+    """A known API endpoint, identified by method and path template."""
+    method: str
+    template: str
+    # Safe to send twice: repeating it cannot create or remove anything a second time
+    idempotent: bool = False
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.template}"
+
+
+def _compile(template: str) -> Pattern[str]:
+    # Anchor at the end only, the base URL may carry a prefix such as /api
+    return re.compile(re.sub(r"\{[^/]+\}", "[^/]+", template) + "$")
+
+
+_ROUTES: List[tuple] = [
+    (Route("GET", "/agents", idempotent=True), _compile("/agents")),
+    (Route("POST", "/agents"), _compile("/agents")),
+    (Route("GET", "/agents/{agent_id}", idempotent=True), _compile("/agents/{agent_id}")),
+    (Route("PUT", "/agents/{agent_id}", idempotent=True), _compile("/agents/{agent_id}")),
+    (Route("DELETE", "/agents/{agent_id}"), _compile("/agents/{agent_id}")),
+    (Route("GET", "/threads", idempotent=True), _compile("/threads")),
+    (Route("POST", "/threads"), _compile("/threads")),
+    (Route("GET", "/threads/{thread_id}", idempotent=True), _compile("/threads/{thread_id}")),
+    (Route("GET", "/threads/{thread_id}/messages", idempotent=True), _compile("/threads/{thread_id}/messages")),
+    (Route("POST", "/threads/{thread_id}/messages"), _compile("/threads/{thread_id}/messages")),
+    (Route("POST", "/threads/{thread_id}/messages/add"), _compile("/threads/{thread_id}/messages/add")),
+    (Route("DELETE", "/threads/{thread_id}/messages/{message_id}"), _compile("/threads/{thread_id}/messages/{message_id}")),
+    (Route("POST", "/thread/{thread_id}/agent/start"), _compile("/thread/{thread_id}/agent/start")),
+    (Route("GET", "/agent-run/{agent_run_id}", idempotent=True), _compile("/agent-run/{agent_run_id}")),
+    (Route("GET", "/agent-run/{agent_run_id}/stream", idempotent=True), _compile("/agent-run/{agent_run_id}/stream")),
+]
+
+
+def match_route(method: str, path: str) -> Route:
+    """Resolve a request to its route template. Unknown paths are their own template."""
+    method = method.upper()
+    path = path.rstrip("/") or "/"
+    for route, pattern in _ROUTES:
+        if route.method == method and pattern.search(path):
+            return route
+    return Route(method, path, idempotent=method in ("GET", "HEAD", "OPTIONS"))
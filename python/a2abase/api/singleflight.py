@@ -0,0 +1,31 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls into one in-flight call.
+
+    While a call for a key is running, later callers with the same key await its
+    result (or its exception) instead of starting their own.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is not None:
+            # shield: one waiter being cancelled must not cancel the call for everyone
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(fn())
+        self._calls[key] = future
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
@@ -0,0 +1,299 @@
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Union
+import asyncio
+import re
+
+import httpx
+
+from .transport import DEFAULT_STREAM_TIMEOUT
+
+_STR_LINE_END = re.compile(r"\r\n|\r|\n")
+
+# Reconnection delay until the server sends a ``retry:`` hint, in seconds
+DEFAULT_RETRY_DELAY = 3.0
+
+
+@dataclass(slots=True)
+class SSEEvent:
+    data: str
+    event: str = "message"
+    id: Optional[str] = None
+    retry: Optional[int] = None
+
+
+class SSEDecoder:
+    """Incremental server-sent events decoder.
+
+    Bytes are fed as they arrive and complete events come out. Follows the
+    WHATWG event-stream rules: multi-line ``data:`` fields are joined with
+    newlines, ``id:`` persists as the last event ID until replaced, comments
+    and unknown fields are ignored.
+
+    With ``data_only`` the decoder returns each event's data string instead of an
+    SSEEvent, for readers that only want the payload. ``last_event_id`` and
+    ``retry`` are tracked either way.
+    """
+
+    def __init__(self, last_event_id: Optional[str] = None, data_only: bool = False):
+        self.last_event_id = last_event_id
+        self.data_only = data_only
+        # Reconnection time asked for by the server, in milliseconds
+        self.retry: Optional[int] = None
+        self._buf = bytearray()
+        self._data: List[str] = []
+        self._event = ""
+        self._started = False
+        # Set once a \r is seen, from then on lines are split on any of \r\n, \r and \n
+        self._cr = False
+        # Past the byte order mark and no \r seen, chunks of whole data events may take the fast path
+        self._plain = False
+
+    def feed(self, chunk: bytes) -> List[Union[SSEEvent, str]]:
+        """Add bytes and return the events completed by them."""
+        if self._plain and not self._buf and chunk[-2:] == b"\n\n":
+            # A token-rate stream delivers chunks holding whole single-line data events,
+            # often one each. Those skip the carry-over buffer and the line splitting.
+            text = chunk.decode("utf-8", "replace")
+            if "\r" not in text:
+                events = self._data_events(text)
+                if events is not None:
+                    return events
+        # Split straight out of the chunk unless a partial event is carried over
+        data = chunk
+        if self._buf:
+            self._buf += chunk
+            data = self._buf
+        # 13 is \r, an int membership test is a plain memchr
+        if not self._cr and 13 in chunk:
+            self._cr = True
+        if self._cr:
+            end = self._complete_end(data)
+        else:
+            end = data.rfind(b"\n\n") + 2
+            if end == 1:
+                end = 0
+        if end == 0:
+            if data is not self._buf:
+                self._buf += data
+            return []
+        # One decode for everything complete in the chunk. Slicing first is cheaper
+        # than decoding through a memoryview at network chunk sizes.
+        if end == len(data):
+            text = data.decode("utf-8", "replace")
+            if data is self._buf:
+                self._buf.clear()
+        else:
+            text = data[:end].decode("utf-8", "replace")
+            if data is self._buf:
+                del self._buf[:end]
+            else:
+                self._buf += data[end:]
+        if not self._started:
+            self._started = True
+            if text.startswith("\ufeff"):
+                text = text[1:]
+        self._plain = not self._cr
+
+        if self._cr:
+            events: List[Union[SSEEvent, str]] = []
+            lines = _STR_LINE_END.split(text)
+            # The text ends with a line terminator, so the last item is always empty
+            lines.pop()
+            self._feed_lines(lines, events)
+            return events
+        # \n line endings, the common case
+        events = self._data_events(text)
+        if events is not None:
+            return events
+        events = []
+        blocks = text.split("\n\n")
+        if text.count("\n") == 2 * (len(blocks) - 1):
+            # No event spans several lines, so a block starting with "data: " is the whole event
+            for block in blocks:
+                if block.startswith("data: "):
+                    events.append(self._make(block[6:], ""))
+                elif block:
+                    self._feed_lines([block, ""], events)
+            return events
+        for block in blocks:
+            if block:
+                self._feed_lines(block.split("\n"), events)
+                event = self._dispatch()
+                if event is not None:
+                    events.append(event)
+        return events
+
+    def _data_events(self, text: str) -> Optional[List[Union[SSEEvent, str]]]:
+        """Events of ``text`` when it is nothing but single-line data events, else None.
+
+        Agent-run streams look like that. Splitting on the separator plus the next
+        prefix yields each event's data in one C-level pass, and no newline may be
+        left in them.
+        """
+        if text[:6] != "data: ":
+            return None
+        # text ends with the blank line closing its last event
+        data = text[6:-2]
+        if "\n" not in data:
+            datas = [data]
+        else:
+            datas = data.split("\n\ndata: ")
+            # Joining and one membership test beat counting newlines in the text
+            if "\n" in "".join(datas):
+                return None
+        if self.data_only:
+            return datas
+        last_event_id, retry = self.last_event_id, self.retry
+        return [SSEEvent(data, "message", last_event_id, retry) for data in datas]
+
+    def _complete_end(self, data) -> int:
+        """Index just past the complete part of ``data``, 0 when there is none.
+
+        With \n line endings that is the end of the last event (a blank line), otherwise
+        the end of the last line.
+        """
+        if not self._cr:
+            end = data.rfind(b"\n\n")
+            return end + 2 if end >= 0 else 0
+        end = data.rfind(b"\n") + 1
+        cr = data.rfind(b"\r")
+        if cr == len(data) - 1:
+            # A trailing \r may be the first half of \r\n, keep it for the next chunk
+            cr = data.rfind(b"\r", 0, cr)
+        return max(end, cr + 1)
+
+    def _feed_lines(self, lines: List[str], events: List[Union[SSEEvent, str]]):
+        pending = self._data
+        for line in lines:
+            if line:
+                if line.startswith("data: "):
+                    pending.append(line[6:])
+                else:
+                    self._line(line)
+            elif pending:
+                events.append(self._make(pending[0] if len(pending) == 1 else "\n".join(pending), self._event))
+                pending = self._data = []
+                self._event = ""
+            else:
+                self._event = ""
+
+    def flush(self) -> List[Union[SSEEvent, str]]:
+        """End of stream: dispatch whatever is pending.
+
+        The spec drops an event not terminated by a blank line. It is kept here, so a
+        final event the server sends without one is not lost.
+        """
+        events = self.feed(b"\n\n") if self._buf else []
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _line(self, line: str):
+        """Process one non-empty line other than ``data: ...``."""
+        if line[0] == ":":
+            return
+        name, _, value = line.partition(":")
+        if value[:1] == " ":
+            value = value[1:]
+        if name == "data":
+            self._data.append(value)
+        elif name == "event":
+            self._event = value
+        elif name == "id":
+            if "\0" not in value:
+                self.last_event_id = value
+        elif name == "retry":
+            if value.isascii() and value.isdigit():
+                self.retry = int(value)
+
+    def _dispatch(self) -> Union[SSEEvent, str, None]:
+        data, event = self._data, self._event
+        self._data, self._event = [], ""
+        if not data:
+            return None
+        return self._make("\n".join(data), event)
+
+    def _make(self, data: str, event: str) -> Union[SSEEvent, str]:
+        if self.data_only:
+            return data
+        return SSEEvent(data, event or "message", self.last_event_id, self.retry)
+
+
+async def iter_sse(chunks: AsyncIterator[bytes], decoder: Optional[SSEDecoder] = None) -> AsyncIterator[SSEEvent]:
+    """Yield the events of a server-sent events body given as byte chunks."""
+    decoder = decoder or SSEDecoder()
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
+    for event in decoder.flush():
+        yield event
+
+
+class EventSource:
+    """Server-sent events from ``url`` that survive dropped connections.
+
+    When the connection fails mid-stream and the server has sent an event ID,
+    the stream is reopened with ``Last-Event-ID`` after the server's ``retry``
+    delay, at most ``max_reconnects`` times, so the server can resume after the
+    last event received.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        timeout: Optional[httpx.Timeout] = None,
+        max_reconnects: int = 3,
+        last_event_id: Optional[str] = None,
+        **kwargs,
+    ):
+        self.client = client
+        self.url = url
+        self.timeout = timeout or DEFAULT_STREAM_TIMEOUT
+        self.max_reconnects = max_reconnects
+        self.last_event_id = last_event_id
+        self.retry_delay = DEFAULT_RETRY_DELAY
+        self.reconnects = 0
+        self._kwargs = kwargs
+
+    def _can_resume(self) -> bool:
+        return self.last_event_id is not None
+
+    def __aiter__(self) -> AsyncIterator[SSEEvent]:
+        return self._stream(data_only=False)
+
+    def data(self) -> AsyncIterator[str]:
+        """Iterate over the events' data only, skipping the SSEEvent built per event."""
+        return self._stream(data_only=True)
+
+    async def _stream(self, data_only: bool) -> AsyncIterator[Union[SSEEvent, str]]:
+        while True:
+            headers = dict(self._kwargs.get("headers") or {})
+            if self.last_event_id is not None:
+                headers["Last-Event-ID"] = self.last_event_id
+            kwargs = {**self._kwargs, "headers": headers}
+            decoder = SSEDecoder(self.last_event_id, data_only=data_only)
+            try:
+                async with self.client.stream("GET", self.url, timeout=self.timeout, **kwargs) as response:
+                    response.raise_for_status()
+                    # Decoder loop inlined rather than through iter_sse: one generator hop less per event
+                    async for chunk in response.aiter_bytes():
+                        for event in decoder.feed(chunk):
+                            yield event
+                        # Once per chunk: a failure can only surface on the next read
+                        self._track(decoder)
+                    for event in decoder.flush():
+                        yield event
+                    self._track(decoder)
+                return
+            except httpx.TransportError:
+                if self.reconnects >= self.max_reconnects or not self._can_resume():
+                    raise
+                self.reconnects += 1
+                await asyncio.sleep(self.retry_delay)
+
+    def _track(self, decoder: SSEDecoder):
+        self.last_event_id = decoder.last_event_id
+        if decoder.retry is not None:
+            self.retry_delay = decoder.retry / 1000
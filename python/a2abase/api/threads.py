@@ -1,12 +1,21 @@
-from dataclasses import dataclass, asdict, field
-from typing import Optional, List, Dict, Any, AsyncGenerator, Union
+from dataclasses import dataclass, asdict, field, fields
+from typing import Optional, List, Dict, Any, AsyncGenerator, AsyncIterator, Set, Union
 from enum import Enum
 import httpx
-import json
 
 from ..models import (
     MessageType,
 )
+from .circuit import CircuitBreakerRegistry
+from .concurrency import AdaptiveConcurrencyLimiter
+from .ratelimit import RateLimiter
+from . import codec
+from .cache import TTLCache
+from .intern import INTERNED_FIELDS, intern_id
+from .jsonstream import iter_json_array
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .transport import DEFAULT_STREAM_TIMEOUT, PoolConfig, create_transport
 
 
 @dataclass
@@ -40,7 +49,7 @@ class AgentStartRequest:
     agent_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Thread:
     thread_id: str
     account_id: str
@@ -51,7 +60,7 @@ class Thread:
     updated_at: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     message_id: str
     thread_id: str
@@ -80,15 +89,38 @@ class StatusContent:
     thread_run_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageMetadata:
     """Metadata model for messages."""
     thread_run_id: Optional[str] = None
 
 
+def _decode_json_field(value: Any) -> Any:
+    """Decode a JSON-encoded string field, falling back to {} when it is not valid JSON."""
+    if not isinstance(value, str):
+        return value
+    try:
+        return codec.loads(value)
+    except (codec.DecodeError, TypeError):
+        return {}
+
+
+def _decode_metadata(value: Any) -> MessageMetadata:
+    metadata = _decode_json_field(value)
+    if not isinstance(metadata, dict):
+        return MessageMetadata()
+    return MessageMetadata(thread_run_id=intern_id(metadata.get("thread_run_id")))
+
+
+# Marks a content/metadata value not decoded yet
+_UNDECODED = object()
+
+
+
 @dataclass
-class MessageLineResponse:
-    """Data model for message line responses from streaming API."""
+class _MessageLineFields:
+    """Field layout of MessageLineResponse, lent to it so the dataclasses helpers
+    (fields, asdict, astuple, replace) keep working on the lazy class."""
     message_id: str
     thread_id: str
     type: str
@@ -99,47 +131,130 @@ class MessageLineResponse:
     updated_at: str
     agent_id: Optional[str] = None
     agent_version_id: Optional[str] = None
-    
+
+
+@dataclass
+class _TypedMessageLineFields(_MessageLineFields):
+    type: str = field(init=False)
+
+
+_MESSAGE_LINE_FIELDS = tuple(f.name for f in fields(_MessageLineFields))
+
+
+class MessageLineResponse:
+    """Data model for message line responses from streaming API.
+
+    The API sends ``content`` and ``metadata`` as JSON strings. Messages built by
+    from_dict keep them raw and decode each on first access, so lines that are only
+    looked at by ``type`` never pay for the nested decode.
+    """
+
+    # No per-instance __dict__, recent stream messages are buffered in bulk
+    __slots__ = (
+        "message_id", "thread_id", "type", "is_llm_message", "created_at", "updated_at",
+        "agent_id", "agent_version_id", "_content", "_raw_content", "_metadata", "_raw_metadata",
+    )
+
+    # Fixed by the typed subclasses, None when ``type`` comes from the data
+    MESSAGE_TYPE: Optional[str] = None
+    __dataclass_fields__ = _MessageLineFields.__dataclass_fields__
+
+    def __init__(
+        self,
+        message_id: str,
+        thread_id: str,
+        type: str,
+        is_llm_message: bool,
+        content: Dict[str, Any],
+        metadata: MessageMetadata,
+        created_at: str,
+        updated_at: str,
+        agent_id: Optional[str] = None,
+        agent_version_id: Optional[str] = None,
+    ):
+        self._set_fields(message_id, thread_id, type, is_llm_message, created_at, updated_at, agent_id, agent_version_id)
+        self._content, self._raw_content = content, None
+        self._metadata, self._raw_metadata = metadata, None
+
+    def _set_fields(self, message_id, thread_id, type, is_llm_message, created_at, updated_at, agent_id, agent_version_id):
+        self.message_id = message_id
+        self.thread_id = thread_id
+        self.type = type
+        self.is_llm_message = is_llm_message
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.agent_id = agent_id
+        self.agent_version_id = agent_version_id
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "MessageLineResponse":
-        """Create MessageLineResponse from API response dictionary."""
-        content_str = data.get("content", "{}")
-        if isinstance(content_str, str):
-            try:
-                content = json.loads(content_str)
-            except (json.JSONDecodeError, TypeError):
-                content = {}
-        else:
-            content = content_str
-        
-        # Parse metadata JSON string
-        metadata_str = data.get("metadata", "{}")
-        if isinstance(metadata_str, str):
-            try:
-                metadata_dict = json.loads(metadata_str)
-            except (json.JSONDecodeError, TypeError):
-                metadata_dict = {}
-        else:
-            metadata_dict = metadata_str
-        
-        # Create MessageMetadata object
-        metadata_obj = MessageMetadata(
-            thread_run_id=metadata_dict.get("thread_run_id")
+        """Create MessageLineResponse from API response dictionary.
+
+        Called on a subtype, the subtype's fixed ``type`` is kept and ``data["type"]`` ignored.
+        """
+        message = cls.__new__(cls)
+        message._set_fields(
+            data["message_id"],
+            intern_id(data["thread_id"]),
+            cls.MESSAGE_TYPE or intern_id(data["type"]),
+            data["is_llm_message"],
+            data["created_at"],
+            data["updated_at"],
+            intern_id(data.get("agent_id")),
+            intern_id(data.get("agent_version_id")),
         )
-        
-        return cls(
-            message_id=data["message_id"],
-            thread_id=data["thread_id"],
-            type=data["type"],
-            is_llm_message=data["is_llm_message"],
+        message._content, message._raw_content = _UNDECODED, data.get("content", "{}")
+        message._metadata, message._raw_metadata = _UNDECODED, data.get("metadata", "{}")
+        return message
+
+    @property
+    def content(self) -> Dict[str, Any]:
+        if self._content is _UNDECODED:
+            self._content = _decode_json_field(self._raw_content)
+            self._raw_content = None
+        return self._content
+
+    @content.setter
+    def content(self, value: Dict[str, Any]):
+        self._content, self._raw_content = value, None
+
+    @property
+    def metadata(self) -> MessageMetadata:
+        if self._metadata is _UNDECODED:
+            self._metadata = _decode_metadata(self._raw_metadata)
+            self._raw_metadata = None
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: MessageMetadata):
+        self._metadata, self._raw_metadata = value, None
+
+    def __eq__(self, other: Any) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _MESSAGE_LINE_FIELDS)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in _MESSAGE_LINE_FIELDS)
+        return f"{self.__class__.__name__}({fields})"
+
+    def to_message(self) -> Message:
+        """The message as returned by the history endpoint; ``content`` stays JSON text when not decoded yet."""
+        content = self._raw_content if self._content is _UNDECODED else self._content
+        metadata = self.metadata
+        return Message(
+            message_id=self.message_id,
+            thread_id=self.thread_id,
+            type=self.type,
+            is_llm_message=self.is_llm_message,
             content=content,
-            metadata=metadata_obj,
-            created_at=data["created_at"],
-            updated_at=data["updated_at"],
-            agent_id=data.get("agent_id"),
-            agent_version_id=data.get("agent_version_id")
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            agent_id=self.agent_id,
+            agent_version_id=self.agent_version_id,
+            metadata={"thread_run_id": metadata.thread_run_id} if metadata is not None else {},
         )
-    
+
     def get_status_content(self) -> Optional[StatusContent]:
         """Get parsed status content if message type is 'status'."""
         if self.type == "status" and isinstance(self.content, dict):
@@ -150,10 +265,33 @@ class MessageLineResponse:
         return None
 
 
-@dataclass
-class StatusMessageLineResponse(MessageLineResponse):
+class _TypedMessageLineResponse(MessageLineResponse):
+    """Base of the subtypes whose ``type`` is fixed, so it is not a constructor argument."""
+    __slots__ = ()
+    __dataclass_fields__ = _TypedMessageLineFields.__dataclass_fields__
+
+    def __init__(
+        self,
+        message_id: str,
+        thread_id: str,
+        is_llm_message: bool,
+        content: Dict[str, Any],
+        metadata: MessageMetadata,
+        created_at: str,
+        updated_at: str,
+        agent_id: Optional[str] = None,
+        agent_version_id: Optional[str] = None,
+    ):
+        super().__init__(
+            message_id, thread_id, self.MESSAGE_TYPE, is_llm_message, content, metadata,
+            created_at, updated_at, agent_id, agent_version_id,
+        )
+
+
+class StatusMessageLineResponse(_TypedMessageLineResponse):
     """Status type message line response."""
-    type: str = field(init=False, default="status")
+    __slots__ = ()
+    MESSAGE_TYPE = "status"
     
     def get_status_type(self) -> Optional[StatusType]:
         """Get the status type enum value."""
@@ -166,16 +304,16 @@ class StatusMessageLineResponse(MessageLineResponse):
         return None
 
 
-@dataclass
-class AssistantResponseEndMessageLineResponse(MessageLineResponse):
+class AssistantResponseEndMessageLineResponse(_TypedMessageLineResponse):
     """Assistant response end type message line response."""
-    type: str = field(init=False, default="assistant_response_end")
+    __slots__ = ()
+    MESSAGE_TYPE = "assistant_response_end"
 
 
-@dataclass
-class AssistantMessageLineResponse(MessageLineResponse):
+class AssistantMessageLineResponse(_TypedMessageLineResponse):
     """Assistant type message line response."""
-    type: str = field(init=False, default="assistant")
+    __slots__ = ()
+    MESSAGE_TYPE = "assistant"
     
     def get_content_text(self) -> Optional[str]:
         """Get the text content from assistant message."""
@@ -184,10 +322,10 @@ class AssistantMessageLineResponse(MessageLineResponse):
         return None
 
 
-@dataclass
-class UserMessageLineResponse(MessageLineResponse):
+class UserMessageLineResponse(_TypedMessageLineResponse):
     """User type message line response."""
-    type: str = field(init=False, default="user")
+    __slots__ = ()
+    MESSAGE_TYPE = "user"
     
     def get_content_text(self) -> Optional[str]:
         """Get the text content from user message."""
@@ -225,6 +363,10 @@ class ThreadsResponse:
 @dataclass
 class MessagesResponse:
     messages: List[Message]
+    # Set when the server has more messages past this page
+    next_cursor: Optional[str] = None
+    # The server sent as many messages as the limit asked for, so more may follow even without a cursor
+    page_full: bool = False
 
 
 @dataclass
@@ -253,10 +395,10 @@ def from_dict(cls, data: Dict[str, Any]):
     for k, v in data.items():
         # Handle 'project' -> 'project_id' mapping for Thread
         if k == "project" and cls == Thread:
-            processed["project_id"] = v
+            processed["project_id"] = intern_id(v)
         # Only include fields that exist in the dataclass
         elif k in field_types:
-            processed[k] = v
+            processed[k] = intern_id(v) if k in INTERNED_FIELDS else v
         # Skip unknown fields like 'message_count', 'recent_agent_runs', etc.
     
     # Handle missing required fields with defaults for Thread
@@ -278,18 +420,26 @@ def from_dict(cls, data: Dict[str, Any]):
 
 
 class ThreadsClient:
-    def __init__(self, base_url: str, auth_token: Optional[str] = None, custom_headers: Optional[Dict[str, str]] = None, timeout: float = 30.0):
+    def __init__(self, base_url: str, auth_token: Optional[str] = None, custom_headers: Optional[Dict[str, str]] = None, timeout: float = 30.0, transport: Optional[httpx.AsyncBaseTransport] = None, pool: Optional[PoolConfig] = None, retry: Optional[RetryPolicy] = None, rate_limiter: Optional[RateLimiter] = None, concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None, circuit_breakers: Optional[CircuitBreakerRegistry] = None, stream_timeout: Optional[httpx.Timeout] = None, thread_cache_ttl: float = 10.0):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.stream_timeout = stream_timeout or DEFAULT_STREAM_TIMEOUT
         self.headers = {"Content-Type": "application/json"}
         if auth_token:
             self.headers["X-API-Key"] = auth_token
         if custom_headers:
             self.headers.update(custom_headers)
-        self.client = httpx.AsyncClient(headers=self.headers, timeout=timeout, base_url=self.base_url)
+        # A transport passed in is shared with other clients and closed by its owner
+        self._owns_transport = transport is None
+        self.transport = transport or create_transport(pool, retry, rate_limiter, concurrency_limiter, circuit_breakers)
+        self.client = httpx.AsyncClient(headers=self.headers, timeout=timeout, base_url=self.base_url, transport=self.transport)
+        self._single_flight = SingleFlight()
+        # Thread metadata by thread_id, dropped whenever this client writes to the thread
+        self.thread_cache: TTLCache[Thread] = TTLCache(thread_cache_ttl)
 
     async def close(self):
-        await self.client.aclose()
+        if self._owns_transport:
+            await self.client.aclose()
 
     async def __aenter__(self):
         return self
@@ -299,39 +449,157 @@ class ThreadsClient:
 
     def _handle_response(self, response: httpx.Response) -> Dict[str, Any]:
         if response.status_code in (200, 201):
-            return response.json()
+            return codec.loads(response.content)
         try:
-            error_message = response.json().get("detail", response.text)
+            error_message = codec.loads(response.content).get("detail", response.text)
         except:
             error_message = response.text
         raise RuntimeError(f"API error ({response.status_code}): {error_message}")
 
+    async def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET and decode, sharing one in-flight request between identical concurrent calls."""
+        async def fetch():
+            return self._handle_response(await self.client.get(path, params=params))
+        return await self._single_flight.do(("GET", str(httpx.URL(path, params=params))), fetch)
+
     async def get_threads(self, page: int = 1, limit: int = 1000) -> ThreadsResponse:
         params = {"page": page, "limit": limit}
-        data = self._handle_response(await self.client.get("/threads", params=params))
+        data = await self._get("/threads", params=params)
         pagination = from_dict(PaginationInfo, data["pagination"])
         threads = [from_dict(Thread, t) for t in data["threads"]]
+        # List rows are full thread records, so later attribute reads need no GET per thread
+        for thread in threads:
+            self.thread_cache.set(thread.thread_id, thread)
         return ThreadsResponse(threads=threads, pagination=pagination)
 
-    async def get_thread(self, thread_id: str) -> Thread:
-        data = self._handle_response(await self.client.get(f"/threads/{thread_id}"))
-        return from_dict(Thread, data)
-
-    async def get_thread_messages(self, thread_id: str, order: str = "desc") -> MessagesResponse:
-        params = {"order": order}
-        data = self._handle_response(await self.client.get(f"/threads/{thread_id}/messages", params=params))
+    async def _stream_list(self, path: str, key: str, params: Optional[Dict[str, Any]] = None, fields: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Decode the ``key`` array of a list response element by element as the body arrives.
+
+        ``fields`` receives the response's other members once the body is complete.
+        """
+        async with self.client.stream("GET", path, params=params) as response:
+            if response.status_code not in (200, 201):
+                await response.aread()
+                self._handle_response(response)
+            async for item in iter_json_array(response.aiter_bytes(), key, fields):
+                yield item
+
+    async def stream_threads(self, page: int = 1, limit: int = 1000, fields: Optional[Dict[str, Any]] = None) -> AsyncIterator[Thread]:
+        """Like get_threads, but yields threads while the page downloads instead of holding it all in memory.
+
+        Pass a dict as ``fields`` to get the raw ``pagination`` member once the last thread has been yielded.
+        """
+        async for data in self._stream_list("/threads", "threads", params={"page": page, "limit": limit}, fields=fields):
+            thread = from_dict(Thread, data)
+            self.thread_cache.set(thread.thread_id, thread)
+            yield thread
+
+    async def get_thread(self, thread_id: str, refresh: bool = False) -> Thread:
+        if not refresh:
+            thread = self.thread_cache.get(thread_id)
+            if thread is not None:
+                return thread
+        data = await self._get(f"/threads/{thread_id}")
+        thread = from_dict(Thread, data)
+        self.thread_cache.set(thread_id, thread)
+        return thread
+
+    async def get_thread_messages(
+        self,
+        thread_id: str,
+        order: str = "desc",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        since_message_id: Optional[str] = None,
+        since_created_at: Optional[str] = None,
+    ) -> MessagesResponse:
+        """Fetch thread messages, optionally one page at a time or only those newer than a known message.
+
+        The since_* filters are sent to the server and also applied to the response,
+        so the result is right even when the server returns the full history.
+        """
+        params: Dict[str, Any] = {"order": order}
+        if limit is not None:
+            params["limit"] = limit
+        if cursor is not None:
+            params["cursor"] = cursor
+        if since_message_id is not None:
+            params["since_message_id"] = since_message_id
+        if since_created_at is not None:
+            params["since_created_at"] = since_created_at
+        data = await self._get(f"/threads/{thread_id}/messages", params=params)
         messages = [from_dict(Message, m) for m in data["messages"]]
-        return MessagesResponse(messages=messages)
+        page_full = limit is not None and len(messages) >= limit
+        messages = _messages_after(messages, order, since_message_id, since_created_at)
+        next_cursor = data.get("next_cursor") or (data.get("pagination") or {}).get("next_cursor")
+        return MessagesResponse(messages=messages, next_cursor=next_cursor, page_full=page_full)
+
+    async def iter_thread_messages(
+        self,
+        thread_id: str,
+        order: str = "asc",
+        page_size: int = 100,
+        since_message_id: Optional[str] = None,
+        since_created_at: Optional[str] = None,
+    ) -> AsyncIterator[Message]:
+        """Yield thread messages page by page, following the server's cursor.
+
+        A full page without a cursor may be a server that honours ``limit`` but
+        does not page by cursor. Oldest-first iteration then continues after the
+        last message received, and when that brings nothing new, or the order is
+        newest-first, the rest is fetched in one unpaged request.
+        """
+        cursor = None
+        seen: Set[str] = set()
+        while True:
+            page = await self.get_thread_messages(
+                thread_id,
+                order=order,
+                limit=page_size,
+                cursor=cursor,
+                since_message_id=since_message_id,
+                since_created_at=since_created_at,
+            )
+            for message in page.messages:
+                seen.add(message.message_id)
+                yield message
+            if page.next_cursor and page.next_cursor != cursor:
+                cursor = page.next_cursor
+                continue
+            if not page.page_full:
+                return
+            if order == "asc" and page.messages:
+                last = page.messages[-1]
+                cursor, since_message_id, since_created_at = None, last.message_id, last.created_at
+                continue
+            break
+        rest = await self.get_thread_messages(
+            thread_id, order=order, since_message_id=since_message_id, since_created_at=since_created_at
+        )
+        for message in rest.messages:
+            if message.message_id not in seen:
+                yield message
+
+    async def stream_thread_messages(self, thread_id: str, order: str = "desc") -> AsyncIterator[Message]:
+        """Like get_thread_messages, but yields messages while the history downloads."""
+        async for data in self._stream_list(f"/threads/{thread_id}/messages", "messages", params={"order": order}):
+            yield from_dict(Message, data)
 
     async def add_message_to_thread(self, thread_id: str, message: str) -> Message:
-        data = self._handle_response(await self.client.post(f"/threads/{thread_id}/messages/add", params={"message": message}, headers={k: v for k, v in self.headers.items() if k != "Content-Type"}))
+        response = await self.client.post(f"/threads/{thread_id}/messages/add", params={"message": message}, headers={k: v for k, v in self.headers.items() if k != "Content-Type"})
+        self.thread_cache.invalidate(thread_id)
+        data = self._handle_response(response)
         return from_dict(Message, data)
 
     async def delete_message_from_thread(self, thread_id: str, message_id: str) -> None:
-        self._handle_response(await self.client.delete(f"/threads/{thread_id}/messages/{message_id}"))
+        response = await self.client.delete(f"/threads/{thread_id}/messages/{message_id}")
+        self.thread_cache.invalidate(thread_id)
+        self._handle_response(response)
 
     async def create_message(self, thread_id: str, request: MessageCreateRequest) -> Message:
-        data = self._handle_response(await self.client.post(f"/threads/{thread_id}/messages", json=to_dict(request)))
+        response = await self.client.post(f"/threads/{thread_id}/messages", **codec.json_body(to_dict(request)))
+        self.thread_cache.invalidate(thread_id)
+        data = self._handle_response(response)
         return from_dict(Message, data)
 
     async def create_thread(self, name: Optional[str] = None) -> CreateThreadResponse:
@@ -350,12 +618,28 @@ class ThreadsClient:
         return f"{self.base_url}/agent-run/{agent_run_id}/stream"
 
     async def start_agent(self, thread_id: str, request: "AgentStartRequest") -> AgentStartResponse:
-        data = self._handle_response(
-            await self.client.post(f"/thread/{thread_id}/agent/start", json=to_dict(request))
-        )
+        response = await self.client.post(f"/thread/{thread_id}/agent/start", **codec.json_body(to_dict(request)))
+        self.thread_cache.invalidate(thread_id)
+        data = self._handle_response(response)
         return from_dict(AgentStartResponse, data)
 
 
-def create_threads_client(base_url: str, auth_token: Optional[str] = None, custom_headers: Optional[Dict[str, str]] = None, timeout: float = 120.0) -> ThreadsClient:
-    return ThreadsClient(base_url=base_url, auth_token=auth_token, custom_headers=custom_headers, timeout=timeout)
+def _messages_after(messages: List[Message], order: str, since_message_id: Optional[str], since_created_at: Optional[str]) -> List[Message]:
+    """Drop messages at or before the given message / timestamp."""
+    if since_created_at is not None:
+        if since_message_id is not None:
+            # Keep messages sharing the timestamp, the message id below tells which were seen
+            messages = [m for m in messages if m.created_at >= since_created_at]
+        else:
+            messages = [m for m in messages if m.created_at > since_created_at]
+    if since_message_id is not None:
+        for i, m in enumerate(messages):
+            if m.message_id == since_message_id:
+                messages = messages[i + 1:] if order == "asc" else messages[:i]
+                break
+    return messages
+
+
+def create_threads_client(base_url: str, auth_token: Optional[str] = None, custom_headers: Optional[Dict[str, str]] = None, timeout: float = 120.0, transport: Optional[httpx.AsyncBaseTransport] = None, pool: Optional[PoolConfig] = None, retry: Optional[RetryPolicy] = None, rate_limiter: Optional[RateLimiter] = None, concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None, circuit_breakers: Optional[CircuitBreakerRegistry] = None, stream_timeout: Optional[httpx.Timeout] = None, thread_cache_ttl: float = 10.0) -> ThreadsClient:
+    return ThreadsClient(base_url=base_url, auth_token=auth_token, custom_headers=custom_headers, timeout=timeout, transport=transport, pool=pool, retry=retry, rate_limiter=rate_limiter, concurrency_limiter=concurrency_limiter, circuit_breakers=circuit_breakers, stream_timeout=stream_timeout, thread_cache_ttl=thread_cache_ttl)
 
@@ -0,0 +1,200 @@
+from dataclasses import dataclass
+from typing import Optional
+import asyncio
+import importlib.util
+import time
+import warnings
+import httpx
+
+from .circuit import CircuitBreakerRegistry
+from .concurrency import AdaptiveConcurrencyLimiter
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy, parse_retry_after
+from .routes import Route, match_route
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings for the transport shared by the SDK clients."""
+    max_connections: Optional[int] = 100
+    max_keepalive_connections: Optional[int] = 20
+    keepalive_expiry: Optional[float] = 30.0
+    # Multiplex concurrent requests and streams over one connection per host.
+    # Negotiated via ALPN, so servers without HTTP/2 are spoken to over HTTP/1.1.
+    http2: bool = False
+
+    def to_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+# Agent runs can stay quiet for minutes between lines, so streams get a long read timeout
+# instead of the request timeout of the client they share a pool with.
+DEFAULT_STREAM_TIMEOUT = httpx.Timeout(connect=30.0, read=300.0, write=30.0, pool=30.0)
+
+
+@dataclass
+class PoolStats:
+    """Snapshot of the connections held by a pooled transport."""
+    connections: int = 0
+    http2_connections: int = 0
+    active_connections: int = 0
+    idle_connections: int = 0
+    queued_requests: int = 0
+
+
+class A2ABaseTransport(httpx.AsyncBaseTransport):
+    """Pooled transport that applies the SDK request policies around every request and stream open."""
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+    ):
+        self.inner = inner
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.circuit_breakers = circuit_breakers
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        route = match_route(request.method, request.url.path)
+        if self.retry is None:
+            return await self._send(request, route)
+        return await self._send_with_retries(request, route, self.retry)
+
+    async def _send(self, request: httpx.Request, route: Route) -> httpx.Response:
+        if self.circuit_breakers is None:
+            return await self._send_limited(request, route)
+        breaker = self.circuit_breakers.breaker_for(route)
+        # Fails fast with CircuitOpenError while the route's backend is considered down
+        breaker.before_request(request)
+        try:
+            response = await self._send_limited(request, route)
+        except httpx.TransportError:
+            breaker.on_failure()
+            raise
+        except BaseException:
+            breaker.on_abandoned()
+            raise
+        if response.status_code >= 500:
+            breaker.on_failure()
+        else:
+            breaker.on_success()
+        return response
+
+    async def _send_limited(self, request: httpx.Request, route: Route) -> httpx.Response:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(route)
+        limiter = self.concurrency_limiter
+        if limiter is not None and limiter.applies_to(route):
+            await limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = await self.inner.handle_async_request(request)
+            except httpx.TimeoutException:
+                limiter.release(None, dropped=True)
+                raise
+            except BaseException:
+                limiter.release(None)
+                raise
+            limiter.release(time.monotonic() - started, dropped=response.status_code in (429, 503))
+        else:
+            response = await self.inner.handle_async_request(request)
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_response(route, response.status_code, parse_retry_after(response.headers.get("Retry-After")))
+        return response
+
+    async def _send_with_retries(self, request: httpx.Request, route: Route, retry: RetryPolicy) -> httpx.Response:
+        if retry.budget is not None:
+            retry.budget.deposit()
+        delay = 0.0
+        attempt = 1
+        while True:
+            try:
+                response = await self._send(request, route)
+            except Exception as e:
+                if attempt >= retry.max_attempts or not retry.should_retry_error(route, e) or not self._withdraw(retry):
+                    raise
+                delay = retry.backoff(delay)
+            else:
+                if attempt >= retry.max_attempts or not retry.should_retry_response(route, response):
+                    return response
+                retry_after = retry.retry_after(response)
+                if retry_after is not None and retry_after > retry.max_retry_after:
+                    return response
+                if not self._withdraw(retry):
+                    return response
+                await response.aclose()
+                delay = retry.backoff(delay)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _withdraw(retry: RetryPolicy) -> bool:
+        return retry.budget is None or retry.budget.withdraw()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_transport(
+    pool: Optional[PoolConfig] = None,
+    retry: Optional[RetryPolicy] = None,
+    rate_limiter: Optional[RateLimiter] = None,
+    concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+) -> A2ABaseTransport:
+    """Create the pooled transport used by AgentsClient, ThreadsClient and agent-run streams.
+
+    Requests are retried with the default RetryPolicy unless one is given,
+    pass RetryPolicy(max_attempts=1) to disable retries. Requests are only
+    rate limited, held to an adaptive in-flight limit or guarded by per-route
+    circuit breakers when a RateLimiter, AdaptiveConcurrencyLimiter or
+    CircuitBreakerRegistry is given.
+    """
+    pool = pool or PoolConfig()
+    retry = retry or RetryPolicy()
+    http2 = pool.http2
+    if http2 and not http2_available():
+        warnings.warn("HTTP/2 requested but the 'h2' package is not installed, falling back to HTTP/1.1. Install it with: pip install a2abase[http2]")
+        http2 = False
+    return A2ABaseTransport(
+        httpx.AsyncHTTPTransport(limits=pool.to_limits(), http2=http2),
+        retry=retry,
+        rate_limiter=rate_limiter,
+        concurrency_limiter=concurrency_limiter,
+        circuit_breakers=circuit_breakers,
+    )
+
+
+def get_pool_stats(transport: httpx.AsyncBaseTransport) -> PoolStats:
+    """Inspect the connection pool behind a transport created by create_transport."""
+    stats = PoolStats()
+    if isinstance(transport, A2ABaseTransport):
+        transport = transport.inner
+    connection_pool = getattr(transport, "_pool", None)
+    if connection_pool is None:
+        return stats
+    for connection in connection_pool.connections:
+        stats.connections += 1
+        if "HTTP/2" in connection.info():
+            stats.http2_connections += 1
+        if connection.is_idle():
+            stats.idle_connections += 1
+        else:
+            stats.active_connections += 1
+    stats.queued_requests = sum(1 for request in getattr(connection_pool, "_requests", []) if request.is_queued())
+    return stats
@@ -1,6 +1,9 @@
-from typing import AsyncGenerator, Dict, Any, Optional
+from typing import AsyncGenerator, Dict, Any, Optional, Type
 import httpx
 import json
+from a2abase.api import codec
+from a2abase.api.sse import EventSource
+from a2abase.api.transport import DEFAULT_STREAM_TIMEOUT
 from a2abase.api.threads import (
     MessageLineResponse,
     StatusMessageLineResponse,
@@ -10,6 +13,17 @@ from a2abase.api.threads import (
 )
 
 
+_DATA_PREFIX = "data: "
+
+# Message type -> model class, types not listed here parse to the base MessageLineResponse
+_MESSAGE_CLASSES: Dict[str, Type[MessageLineResponse]] = {
+    "status": StatusMessageLineResponse,
+    "assistant_response_end": AssistantResponseEndMessageLineResponse,
+    "assistant": AssistantMessageLineResponse,
+    "user": UserMessageLineResponse,
+}
+
+
 class MessageResponseUtil:
     """Utility class for message response operations."""
     
@@ -17,70 +31,15 @@ class MessageResponseUtil:
     def to_model(json_str: str) -> Optional[MessageLineResponse]:
         """Convert JSON string to appropriate MessageLineResponse sub-type model."""
         try:
-            line = json_str.replace("data: ", "")
-            data = json.loads(line)
+            # Decode in place after the SSE prefix rather than copying the line without it
+            start = len(_DATA_PREFIX) if json_str.startswith(_DATA_PREFIX) else 0
+            data = codec.loads_from(json_str, start)
             
             # Handle completion status
-            if "status" in data and data["status"] == "completed":
-                return line
+            if data.get("status") == "completed":
+                return json_str[start:]
             
-            # Parse the base message to get all fields
-            base_message = MessageLineResponse.from_dict(data)
-            
-            # Determine and return the appropriate sub-type based on message type
-            message_type = data.get("type", "")
-            
-            if message_type == "status":
-                return StatusMessageLineResponse(
-                    message_id=base_message.message_id,
-                    thread_id=base_message.thread_id,
-                    is_llm_message=base_message.is_llm_message,
-                    content=base_message.content,
-                    metadata=base_message.metadata,
-                    created_at=base_message.created_at,
-                    updated_at=base_message.updated_at,
-                    agent_id=base_message.agent_id,
-                    agent_version_id=base_message.agent_version_id,
-                )
-            elif message_type == "assistant_response_end":
-                return AssistantResponseEndMessageLineResponse(
-                    message_id=base_message.message_id,
-                    thread_id=base_message.thread_id,
-                    is_llm_message=base_message.is_llm_message,
-                    content=base_message.content,
-                    metadata=base_message.metadata,
-                    created_at=base_message.created_at,
-                    updated_at=base_message.updated_at,
-                    agent_id=base_message.agent_id,
-                    agent_version_id=base_message.agent_version_id,
-                )
-            elif message_type == "assistant":
-                return AssistantMessageLineResponse(
-                    message_id=base_message.message_id,
-                    thread_id=base_message.thread_id,
-                    is_llm_message=base_message.is_llm_message,
-                    content=base_message.content,
-                    metadata=base_message.metadata,
-                    created_at=base_message.created_at,
-                    updated_at=base_message.updated_at,
-                    agent_id=base_message.agent_id,
-                    agent_version_id=base_message.agent_version_id,
-                )
-            elif message_type == "user":
-                return UserMessageLineResponse(
-                    message_id=base_message.message_id,
-                    thread_id=base_message.thread_id,
-                    is_llm_message=base_message.is_llm_message,
-                    content=base_message.content,
-                    metadata=base_message.metadata,
-                    created_at=base_message.created_at,
-                    updated_at=base_message.updated_at,
-                    agent_id=base_message.agent_id,
-                    agent_version_id=base_message.agent_version_id,
-                )
-            else:
-                # Return base type for unknown types
-                return base_message
+            return _MESSAGE_CLASSES.get(data.get("type", ""), MessageLineResponse).from_dict(data)
                 
         except json.JSONDecodeError:
             return None
@@ -90,30 +49,36 @@ class MessageResponseUtil:
             return None
 
 
-async def stream_from_url(url: str, **kwargs) -> AsyncGenerator[str, None]:
+async def stream_from_url(
+    url: str,
+    client: Optional[httpx.AsyncClient] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    max_reconnects: int = 3,
+    **kwargs,
+) -> AsyncGenerator[str, None]:
     """
-    Helper function that takes a URL and returns an async generator yielding lines.
+    Helper function that takes a server-sent events URL and returns an async generator yielding event data.
 
     Args:
         url: The URL to stream from
+        client: Optional client to stream through, so the stream reuses its connection pool.
+            A temporary client is created when omitted.
+        timeout: Timeout profile for this stream, defaults to DEFAULT_STREAM_TIMEOUT
+        max_reconnects: How many times a dropped connection is resumed with Last-Event-ID
         **kwargs: Additional arguments to pass to httpx.AsyncClient.stream()
 
     Yields:
-        str: Each line from the streaming response
+        str: The data of each event, multi-line data joined with newlines
     """
     # Configure timeout settings to prevent ReadTimeout errors
-    timeout = httpx.Timeout(
-        connect=30.0,
-        read=300.0,
-        write=30.0,
-        pool=30.0,
-    )
-
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        async with client.stream("GET", url, **kwargs) as response:
-            response.raise_for_status()
+    timeout = timeout or DEFAULT_STREAM_TIMEOUT
 
-            async for line in response.aiter_lines():
-                if line.strip():
-                    yield line.strip()
+    if client is None:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            async for data in stream_from_url(url, client=client, timeout=timeout, max_reconnects=max_reconnects, **kwargs):
+                yield data
+        return
 
+    async for data in EventSource(client, url, timeout=timeout, max_reconnects=max_reconnects, **kwargs).data():
+        if data:
+            yield data
@@ -0,0 +1,337 @@
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+import json
+import re
+import sqlite3
+
+from .api.agents import AgentResponse
+from .api.intern import intern_id
+from .api.threads import Message, MessageLineResponse, Thread, ThreadsClient, _messages_after
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    account_id TEXT,
+    project_id TEXT,
+    metadata TEXT,
+    is_public INTEGER,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS messages (
+    message_id TEXT PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    type TEXT,
+    is_llm_message INTEGER,
+    content TEXT,
+    metadata TEXT,
+    agent_id TEXT,
+    agent_version_id TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    body_text TEXT,
+    tool_text TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_thread_created ON messages (thread_id, created_at, message_id);
+CREATE INDEX IF NOT EXISTS messages_agent ON messages (agent_id);
+CREATE TABLE IF NOT EXISTS agents (
+    agent_id TEXT PRIMARY KEY,
+    name TEXT
+);
+-- Newest message fetched by sync_thread. Kept apart from the messages table, which
+-- streamed messages also land in ahead of the history before them.
+CREATE TABLE IF NOT EXISTS sync_state (
+    thread_id TEXT PRIMARY KEY,
+    message_id TEXT,
+    created_at TEXT
+);
+"""
+
+# External-content FTS5 tables kept in step with their base tables by triggers,
+# so the indexed text is stored once
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(body_text, tool_text, content='messages', content_rowid='rowid');
+CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, body_text, tool_text) VALUES (new.rowid, new.body_text, new.tool_text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, body_text, tool_text) VALUES ('delete', old.rowid, old.body_text, old.tool_text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, body_text, tool_text) VALUES ('delete', old.rowid, old.body_text, old.tool_text);
+    INSERT INTO messages_fts (rowid, body_text, tool_text) VALUES (new.rowid, new.body_text, new.tool_text);
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS agents_fts USING fts5(name, content='agents', content_rowid='rowid');
+CREATE TRIGGER IF NOT EXISTS agents_fts_insert AFTER INSERT ON agents BEGIN
+    INSERT INTO agents_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS agents_fts_delete AFTER DELETE ON agents BEGIN
+    INSERT INTO agents_fts (agents_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS agents_fts_update AFTER UPDATE ON agents BEGIN
+    INSERT INTO agents_fts (agents_fts, rowid, name) VALUES ('delete', old.rowid, old.name);
+    INSERT INTO agents_fts (rowid, name) VALUES (new.rowid, new.name);
+END;
+"""
+
+_MESSAGE_COLUMNS = "message_id, thread_id, type, is_llm_message, content, metadata, created_at, updated_at, agent_id, agent_version_id"
+
+# Upsert rather than INSERT OR REPLACE: keeps the rowid stable and fires the update trigger
+_UPSERT_MESSAGE = f"""
+INSERT INTO messages ({_MESSAGE_COLUMNS}, body_text, tool_text) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (message_id) DO UPDATE SET
+    thread_id = excluded.thread_id, type = excluded.type, is_llm_message = excluded.is_llm_message,
+    content = excluded.content, metadata = excluded.metadata, created_at = excluded.created_at,
+    updated_at = excluded.updated_at, agent_id = excluded.agent_id, agent_version_id = excluded.agent_version_id,
+    body_text = excluded.body_text, tool_text = excluded.tool_text
+"""
+
+_TERM = re.compile(r"\w+")
+
+# Message types whose content is the output of a tool call
+TOOL_MESSAGE_TYPES = frozenset({"tool"})
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+def _strings(value: Any) -> Iterator[str]:
+    """Every string inside a decoded message content, skipping the chat role."""
+    if isinstance(value, str):
+        # Content is sometimes itself JSON encoded
+        if value[:1] in ("{", "["):
+            try:
+                yield from _strings(json.loads(value))
+                return
+            except ValueError:
+                pass
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key != "role":
+                yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def _searchable_text(message: Message) -> Tuple[Optional[str], Optional[str]]:
+    """(body text, tool result text) indexed for a message."""
+    text = " ".join(_strings(message.content)) or None
+    if message.type in TOOL_MESSAGE_TYPES:
+        return None, text
+    return text, None
+
+
+class LocalStore:
+    """SQLite mirror of threads and messages, so repeated reads are served locally
+    and only new messages cross the network. Runs in WAL mode so readers never
+    block the writer."""
+
+    def __init__(self, path: str = "a2abase.db"):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5, search falls back to LIKE scans
+            self.fts_enabled = False
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def upsert_thread(self, thread: Thread):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO threads VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread.thread_id,
+                    thread.account_id,
+                    _dumps(thread.project_id),
+                    _dumps(thread.metadata),
+                    int(bool(thread.is_public)),
+                    thread.created_at,
+                    thread.updated_at,
+                ),
+            )
+
+    def upsert_messages(self, messages: Iterable[Message]):
+        with self._conn:
+            self._conn.executemany(_UPSERT_MESSAGE, self._message_rows(messages))
+
+    @staticmethod
+    def _message_rows(messages: Iterable[Message]) -> List[Tuple]:
+        return [
+            (
+                m.message_id,
+                m.thread_id,
+                m.type,
+                int(bool(m.is_llm_message)),
+                _dumps(m.content),
+                _dumps(m.metadata),
+                m.created_at,
+                m.updated_at,
+                m.agent_id,
+                m.agent_version_id,
+                *_searchable_text(m),
+            )
+            for m in messages
+        ]
+
+    def upsert_agents(self, agents: Iterable[AgentResponse]):
+        """Record agent names so messages can be found by the agent that wrote them."""
+        rows = [(a.agent_id, a.name) for a in agents]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO agents (agent_id, name) VALUES (?, ?) ON CONFLICT (agent_id) DO UPDATE SET name = excluded.name "
+                "WHERE name IS NOT excluded.name",
+                rows,
+            )
+
+    def record_stream_message(self, message: MessageLineResponse):
+        """Mirror a message received from an agent-run stream."""
+        self.record_stream_messages([message])
+
+    def record_stream_messages(self, messages: Iterable[MessageLineResponse]):
+        """Mirror messages received from an agent-run stream in one transaction."""
+        self.upsert_messages([m.to_message() for m in messages if m.message_id])
+
+    def get_thread(self, thread_id: str) -> Optional[Thread]:
+        row = self._conn.execute("SELECT * FROM threads WHERE thread_id = ?", (thread_id,)).fetchone()
+        if row is None:
+            return None
+        return Thread(
+            thread_id=row[0],
+            account_id=row[1],
+            project_id=json.loads(row[2]),
+            metadata=json.loads(row[3]),
+            is_public=bool(row[4]),
+            created_at=row[5],
+            updated_at=row[6],
+        )
+
+    def get_messages(
+        self,
+        thread_id: str,
+        order: str = "desc",
+        since_created_at: Optional[str] = None,
+        since_message_id: Optional[str] = None,
+    ) -> List[Message]:
+        """Mirrored messages of a thread, filtered like ThreadsClient.get_thread_messages."""
+        direction = "ASC" if order == "asc" else "DESC"
+        query = f"SELECT {_MESSAGE_COLUMNS} FROM messages WHERE thread_id = ?"
+        params: Tuple = (thread_id,)
+        if since_created_at is not None:
+            # With a message ID, messages sharing its timestamp are kept for _messages_after to sort out
+            query += " AND created_at >= ?" if since_message_id is not None else " AND created_at > ?"
+            params += (since_created_at,)
+        query += f" ORDER BY created_at {direction}, message_id {direction}"
+        messages = [self._message_from_row(row) for row in self._conn.execute(query, params)]
+        return _messages_after(messages, order, since_message_id, since_created_at)
+
+    def search(self, query: str, limit: int = 50) -> List[Message]:
+        """Find mirrored messages whose content, tool results or agent name contain every word of ``query``.
+
+        Best matches come first when FTS5 is available, otherwise newest first.
+        """
+        terms = _TERM.findall(query)
+        if not terms:
+            return []
+        if self.fts_enabled:
+            # Each term may match the message text or the agent name, like the LIKE fallback:
+            # hits are tagged with their term and a message must be hit by every term
+            hits = []
+            params: Tuple = ()
+            for i, term in enumerate(terms):
+                hits.append(
+                    f"SELECT rowid AS message_rowid, rank, {i} AS term FROM messages_fts WHERE messages_fts MATCH ? "
+                    f"UNION ALL SELECT m.rowid, agents_fts.rank, {i} FROM agents_fts "
+                    "JOIN agents a ON a.rowid = agents_fts.rowid JOIN messages m ON m.agent_id = a.agent_id "
+                    "WHERE agents_fts MATCH ?"
+                )
+                params += (f'"{term}"*', f'"{term}"*')
+            sql = f"""
+                SELECT {_MESSAGE_COLUMNS} FROM ({" UNION ALL ".join(hits)}) hits
+                JOIN messages ON messages.rowid = hits.message_rowid
+                GROUP BY messages.rowid
+                HAVING COUNT(DISTINCT hits.term) = ?
+                ORDER BY MIN(hits.rank), created_at DESC
+                LIMIT ?
+            """
+            params += (len(terms), limit)
+        else:
+            conditions = []
+            params = ()
+            for term in terms:
+                pattern = f"%{term}%"
+                conditions.append(
+                    "(body_text LIKE ? OR tool_text LIKE ? OR agent_id IN (SELECT agent_id FROM agents WHERE name LIKE ?))"
+                )
+                params += (pattern, pattern, pattern)
+            sql = f"SELECT {_MESSAGE_COLUMNS} FROM messages WHERE {' AND '.join(conditions)} ORDER BY created_at DESC LIMIT ?"
+            params += (limit,)
+        return [self._message_from_row(row) for row in self._conn.execute(sql, params)]
+
+    @staticmethod
+    def _message_from_row(row: Tuple) -> Message:
+        return Message(
+            message_id=row[0],
+            thread_id=intern_id(row[1]),
+            type=intern_id(row[2]),
+            is_llm_message=bool(row[3]),
+            content=json.loads(row[4]),
+            metadata=json.loads(row[5]),
+            created_at=row[6],
+            updated_at=row[7],
+            agent_id=intern_id(row[8]),
+            agent_version_id=intern_id(row[9]),
+        )
+
+    def sync_watermark(self, thread_id: str) -> Optional[Tuple[str, str]]:
+        """(message_id, created_at) of the newest message sync_thread has fetched, None before the first sync."""
+        return self._conn.execute(
+            "SELECT message_id, created_at FROM sync_state WHERE thread_id = ?", (thread_id,)
+        ).fetchone()
+
+    def _store_synced(self, thread_id: str, messages: List[Message]):
+        """Mirror a batch of synced messages, oldest first, and advance the watermark to its last one."""
+        last = messages[-1]
+        with self._conn:
+            self._conn.executemany(_UPSERT_MESSAGE, self._message_rows(messages))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)", (thread_id, last.message_id, last.created_at)
+            )
+
+    async def sync_thread(self, client: ThreadsClient, thread_id: str) -> int:
+        """Bring a thread's mirror up to date, fetching only messages newer than the last sync.
+
+        The first sync of a thread fetches its whole history, whatever the stream
+        already mirrored. Returns the number of messages fetched.
+        """
+        self.upsert_thread(await client.get_thread(thread_id))
+        watermark = self.sync_watermark(thread_id)
+        since_message_id, since_created_at = watermark if watermark else (None, None)
+        batch: List[Message] = []
+        added = 0
+        async for message in client.iter_thread_messages(
+            thread_id, since_message_id=since_message_id, since_created_at=since_created_at
+        ):
+            batch.append(message)
+            if len(batch) >= 500:
+                self._store_synced(thread_id, batch)
+                added += len(batch)
+                batch = []
+        if batch:
+            self._store_synced(thread_id, batch)
+            added += len(batch)
+        return added
@@ -1,44 +1,85 @@
-from typing import AsyncGenerator
+from typing import TYPE_CHECKING, AsyncGenerator, AsyncIterator, List, Optional, Set
+import asyncio
 
-from .api.threads import ThreadsClient
-from .api.utils import stream_from_url, MessageResponseUtil
+import httpx
+
+from .api import codec
+from .api.threads import ThreadsClient, Thread as ThreadMetadata
+from .api.sse import EventSource
+from .api.utils import MessageResponseUtil
+from .api.pagination import iter_pages
 from .api.threads import MessageLineResponse
 
+if TYPE_CHECKING:
+    from .store import LocalStore
+
+# Statuses of the final line the server sends before closing an agent-run stream
+_RUN_END_STATUSES = frozenset({"completed", "failed", "stopped", "error"})
+
+
+def _is_run_end(data: str) -> bool:
+    try:
+        line = codec.loads(data)
+    except codec.DecodeError:
+        return False
+    return isinstance(line, dict) and line.get("status") in _RUN_END_STATUSES
+
 
 class Thread:
-    def __init__(self, client: ThreadsClient, thread_id: str):
+    def __init__(self, client: ThreadsClient, thread_id: str, store: Optional["LocalStore"] = None):
         self._client = client
         self._thread_id = thread_id
+        # Local mirror, when set message reads are served from it after syncing the delta
+        self._store = store
+        self._metadata: Optional[ThreadMetadata] = None
+        # Newest message returned by get_new_messages
+        self._last_message_id: Optional[str] = None
+        self._last_message_created_at: Optional[str] = None
 
     def get_thread_id(self):
         return self._thread_id
 
+    @property
+    def metadata(self) -> Optional[ThreadMetadata]:
+        """Thread metadata from the last fetch, None until fetched."""
+        return self._metadata
+
+    async def refresh(self) -> ThreadMetadata:
+        """Fetch the thread metadata, bypassing the client's thread cache."""
+        self._metadata = await self._client.get_thread(self._thread_id, refresh=True)
+        return self._metadata
+
+    async def _get_metadata(self) -> ThreadMetadata:
+        # Served from the client's TTL cache, so reading several attributes costs one round trip
+        self._metadata = await self._client.get_thread(self._thread_id)
+        return self._metadata
+
     async def get_account_id(self):
-        thread = await self._client.get_thread(self._thread_id)
+        thread = await self._get_metadata()
         return thread.account_id
 
     async def get_project_id(self):
-        thread = await self._client.get_thread(self._thread_id)
+        thread = await self._get_metadata()
         return thread.project_id
 
     async def get_project_name(self):
-        thread = await self._client.get_thread(self._thread_id)
+        thread = await self._get_metadata()
         return thread.project_id["name"]
     
     async def get_project_description(self):
-        thread = await self._client.get_thread(self._thread_id)
+        thread = await self._get_metadata()
         return thread.project_id["description"]
 
     async def is_public(self):
-        thread = await self._client.get_thread(self._thread_id)
+        thread = await self._get_metadata()
         return thread.project_id["is_public"]
 
     async def get_created_at(self):
-        thread = await self._client.get_thread(self._thread_id)
+        thread = await self._get_metadata()
         return thread.created_at
 
     async def get_updated_at(self):
-        thread = await self._client.get_thread(self._thread_id)
+        thread = await self._get_metadata()
         return thread.updated_at
 
     async def add_message(self, message: str):
@@ -48,15 +89,49 @@ class Thread:
     async def del_message(self, message_id: str):
         await self._client.delete_message_from_thread(self._thread_id, message_id)
 
-    async def get_messages(self):
-        response = await self._client.get_thread_messages(self._thread_id)
+    async def sync(self) -> int:
+        """Fetch messages newer than the local mirror's newest one. Returns how many were added."""
+        if self._store is None:
+            raise RuntimeError("Thread has no local store, create the client with store=LocalStore(...)")
+        return await self._store.sync_thread(self._client, self._thread_id)
+
+    async def get_messages(self, since_message_id: str | None = None, since_created_at: str | None = None):
+        if self._store is not None:
+            await self.sync()
+            return self._store.get_messages(self._thread_id, since_created_at=since_created_at, since_message_id=since_message_id)
+        response = await self._client.get_thread_messages(
+            self._thread_id, since_message_id=since_message_id, since_created_at=since_created_at
+        )
         return response.messages
 
+    async def iter_messages(self, page_size: int = 100, since_message_id: str | None = None, since_created_at: str | None = None):
+        """Iterate over the thread history oldest first, one page at a time."""
+        async for message in self._client.iter_thread_messages(
+            self._thread_id, page_size=page_size, since_message_id=since_message_id, since_created_at=since_created_at
+        ):
+            yield message
+
+    async def get_new_messages(self):
+        """Messages added since the previous call, the full history on the first call.
+
+        Meant for polling: only messages newer than the last one returned are transferred.
+        """
+        messages = [
+            message
+            async for message in self._client.iter_thread_messages(
+                self._thread_id, since_message_id=self._last_message_id, since_created_at=self._last_message_created_at
+            )
+        ]
+        if messages:
+            self._last_message_id = messages[-1].message_id
+            self._last_message_created_at = messages[-1].created_at
+        return messages
+
     async def get_agent_runs(self, agent_run_id: str | None = None):
         data = await self._client.client.get(f"/threads/{self._thread_id}")
         if data.status_code >= 400:
             return None
-        thread_data = data.json()
+        thread_data = codec.loads(data.content)
         recent_runs = thread_data.get("recent_agent_runs", [])
         print(recent_runs)
         if not recent_runs:
@@ -75,6 +150,9 @@ class Thread:
         return await self.get_agent_runs(agent_run_id=agent_run_id)
 
 class AgentRun:
+    # Streamed messages mirrored to the local store per transaction
+    STORE_BATCH_SIZE = 50
+
     def __init__(self, thread: Thread, agent_run_id: str):
         self._thread = thread
         self._agent_run_id = agent_run_id
@@ -87,11 +165,11 @@ class AgentRun:
             
             if response.status_code >= 400:
                 try:
-                    error_detail = response.json().get("detail", f"HTTP {response.status_code}")
+                    error_detail = codec.loads(response.content).get("detail", f"HTTP {response.status_code}")
                 except:
                     error_detail = f"HTTP {response.status_code}"
                 raise Exception(f"Failed to fetch agent run {self._agent_run_id}: {error_detail}")
-            self._agent_run_data = response.json()
+            self._agent_run_data = codec.loads(response.content)
         return self._agent_run_data
 
     async def get_agent_run_id(self):
@@ -117,22 +195,113 @@ class AgentRun:
         data = await self._get_agent_run_data()
         return data["error"]
 
-    async def get_stream(self) -> AsyncGenerator[str, None]:
-        stream_url = self._thread._client.get_agent_run_stream_url(self._agent_run_id)
-        stream = stream_from_url(stream_url, headers=self._thread._client.headers)
-        async for line in stream:
-            yield MessageResponseUtil.to_model(line)
+    async def get_stream(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        max_reconnects: int = 5,
+        reconnect_on_close: bool = False,
+    ) -> AsyncGenerator[str, None]:
+        """Stream the run's messages until it ends.
+
+        When the connection drops or times out the stream is reopened up to
+        ``max_reconnects`` times, waiting the server's ``retry`` delay (3 s by
+        default) each time. Once the server has sent event IDs it resumes after the
+        last one (Last-Event-ID). Otherwise the server may replay the run from the
+        start: events reopening the stream that match ones already yielded are
+        skipped until the first new one. Messages seen before are also skipped by
+        ``message_id``, so consumers see one continuous stream. Raises
+        httpx.TransportError when the budget runs out before the run ends.
+
+        A stream closed cleanly ends the iteration, whether or not a final status
+        line (completed, failed, stopped or error) was received. With
+        ``reconnect_on_close`` a close before that line counts as a dropped
+        connection, e.g. behind a proxy that cuts long responses, and
+        httpx.RemoteProtocolError is raised once the budget runs out.
+
+        An open circuit breaker (CircuitOpenError) is not a transport error and is
+        raised at once, without reconnecting.
+        """
+        threads_client = self._thread._client
+        stream_url = threads_client.get_agent_run_stream_url(self._agent_run_id)
+        if client is None:
+            # The pooled client already carries the auth headers
+            source = EventSource(threads_client.client, stream_url, timeout=threads_client.stream_timeout, max_reconnects=0)
+        else:
+            source = EventSource(client, stream_url, timeout=threads_client.stream_timeout, max_reconnects=0, headers=threads_client.headers)
+        store = self._thread._store
+        # Stream messages waiting to be mirrored, written in batches rather than one transaction per line
+        pending: List[MessageLineResponse] = []
+        seen: Set[str] = set()
+        # Hashes of the event data yielded so far, to recognise a replay after reconnecting without an event ID
+        yielded: Set[int] = set()
+        reconnects = 0
+        try:
+            while True:
+                replaying = reconnects > 0 and source.last_event_id is None
+                try:
+                    async for data in source.data():
+                        if not data:
+                            continue
+                        fingerprint = hash(data)
+                        if replaying:
+                            if fingerprint in yielded:
+                                continue
+                            # The server resumed, or the replay caught up with what was yielded
+                            replaying = False
+                        yielded.add(fingerprint)
+                        message = MessageResponseUtil.to_model(data)
+                        if isinstance(message, MessageLineResponse):
+                            if message.message_id:
+                                if message.message_id in seen:
+                                    # Replayed after a reconnect
+                                    continue
+                                seen.add(message.message_id)
+                            if store is not None:
+                                pending.append(message)
+                                if len(pending) >= self.STORE_BATCH_SIZE:
+                                    store.record_stream_messages(pending)
+                                    pending.clear()
+                        elif _is_run_end(data):
+                            yield message
+                            return
+                        yield message
+                except httpx.TransportError:
+                    if reconnects >= max_reconnects:
+                        raise
+                else:
+                    if not reconnect_on_close:
+                        return
+                    if reconnects >= max_reconnects:
+                        # Closed without a final status, e.g. by a proxy: the run may not be over
+                        raise httpx.RemoteProtocolError(f"Stream of agent run {self._agent_run_id} closed before the run ended")
+                reconnects += 1
+                await asyncio.sleep(source.retry_delay)
+        finally:
+            if pending:
+                store.record_stream_messages(pending)
 
 class A2ABaseThread:
-    def __init__(self, client: ThreadsClient):
+    def __init__(self, client: ThreadsClient, store: Optional["LocalStore"] = None):
         self._client = client
+        self._store = store
 
     async def create(self, name: str | None = None) -> Thread:
         thread_data = await self._client.create_thread(name)
-        return Thread(self._client, thread_data.thread_id)
+        return Thread(self._client, thread_data.thread_id, store=self._store)
 
     async def get(self, thread_id: str) -> Thread:
-        return Thread(self._client, thread_id)
+        return Thread(self._client, thread_id, store=self._store)
+
+    async def iter_all(self, page_size: int = 100, prefetch: int = 1) -> AsyncIterator[Thread]:
+        """Iterate over every thread of the account, fetching the next page while the current one is consumed."""
+        async def fetch_page(page: int):
+            resp = await self._client.get_threads(page=page, limit=page_size)
+            return resp.threads, resp.pagination.pages
+
+        async for data in iter_pages(fetch_page, prefetch=prefetch):
+            thread = Thread(self._client, data.thread_id, store=self._store)
+            thread._metadata = data
+            yield thread
 
     async def delete(self, thread_id: str) -> None:
         await self._client.delete_thread(thread_id)
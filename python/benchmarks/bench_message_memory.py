@@ -0,0 +1,111 @@
+"""
+Benchmark: memory held by buffered messages, slotted models vs. per-instance __dict__.
+
+Builds 100k stream messages (as an agent-run stream yields them) and 100k
+history messages (as get_thread_messages returns them), keeps them in a list
+and reports the traced bytes per message. "before" uses subclasses that get a
+per-instance __dict__ back, i.e. the models as they were before __slots__.
+
+Usage:
+    python benchmarks/bench_message_memory.py [messages]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from a2abase.api import codec
+from a2abase.api.threads import Message, MessageLineResponse, MessageMetadata
+
+
+class DictMessageLineResponse(MessageLineResponse):
+    """MessageLineResponse with a per-instance __dict__."""
+
+
+@dataclass
+class DictMessage(Message):
+    """Message with a per-instance __dict__."""
+
+
+@dataclass
+class DictMessageMetadata(MessageMetadata):
+    """MessageMetadata with a per-instance __dict__."""
+
+
+def stream_line(i: int) -> str:
+    return "data: " + json.dumps({
+        "message_id": f"6f1c1c9e-8a3e-4c8e-9d55-{i:012d}",
+        "thread_id": "0b6a5a42-1f3c-4f2e-8a0d-7c9b6e4d3a21",
+        "type": "assistant",
+        "is_llm_message": True,
+        "content": json.dumps({"role": "assistant", "content": f"chunk {i}"}),
+        "metadata": json.dumps({"thread_run_id": "run-1"}),
+        "created_at": "2025-01-01T00:00:00.000000+00:00",
+        "updated_at": "2025-01-01T00:00:00.000000+00:00",
+        "agent_id": "4c0f8a9e-2b1d-4e6f-9a3c-8d7e6f5a4b3c",
+        "agent_version_id": "9e8d7c6b-5a4f-4e3d-2c1b-0a9f8e7d6c5b",
+    })
+
+
+def history_row(i: int, message_cls, metadata_cls):
+    data = codec.loads(stream_line(i)[6:])
+    return message_cls(
+        message_id=data["message_id"],
+        thread_id=data["thread_id"],
+        type=data["type"],
+        is_llm_message=data["is_llm_message"],
+        content=codec.loads(data["content"]),
+        created_at=data["created_at"],
+        updated_at=data["updated_at"],
+        agent_id=data["agent_id"],
+        agent_version_id=data["agent_version_id"],
+        metadata=metadata_cls(thread_run_id="run-1"),
+    )
+
+
+def measure(build, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    buffered = [build(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del buffered
+    return current / count
+
+
+def report(name: str, before: float, after: float):
+    print(f"{name:<22} {before:8.0f} B  {after:8.0f} B  {1 - after / before:6.1%}")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    lines = [stream_line(i) for i in range(count)]
+
+    def stream_message(cls):
+        def build(i):
+            message = cls.from_dict(codec.loads_from(lines[i], 6))
+            message.content, message.metadata  # consumers read them, decode both
+            return message
+        return build
+
+    print(f"{count:,} buffered messages, bytes per message (including field values)")
+    print(f"{'':<22} {'before':>10}  {'after':>10}  {'saved':>6}")
+    report(
+        "stream (undecoded)",
+        measure(lambda i: DictMessageLineResponse.from_dict(codec.loads_from(lines[i], 6)), count),
+        measure(lambda i: MessageLineResponse.from_dict(codec.loads_from(lines[i], 6)), count),
+    )
+    report("stream (decoded)", measure(stream_message(DictMessageLineResponse), count), measure(stream_message(MessageLineResponse), count))
+    report(
+        "history Message",
+        measure(lambda i: history_row(i, DictMessage, DictMessageMetadata), count),
+        measure(lambda i: history_row(i, Message, MessageMetadata), count),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: reading an agent-run stream, line by line vs. the byte-level SSE decoder.
+
+Serves a synthetic event-stream body in network-sized chunks from an in-process
+transport and reads it through:
+  aiter_lines  the previous stream_from_url: httpx's aiter_lines() and two
+               strip() calls per line
+  sse          the current stream_from_url: SSEDecoder splitting the byte
+               buffer and decoding each chunk's complete lines once
+Both hand one string per event to the parser. Reports the best of three runs
+in events/sec for each.
+
+Live token streams mostly arrive one event per read, pass a chunk_size of about
+one event (356 bytes here) to measure that case.
+
+Usage:
+    python benchmarks/bench_sse_split.py [events] [chunk_size]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from a2abase.api.utils import stream_from_url
+
+LINE = (
+    b'data: {"message_id": "6f1c1c9e-8a3e-4c8e-9d55-3f0e6f1b2a7d", "thread_id": "0b6a5a42-1f3c-4f2e-8a0d-7c9b6e4d3a21", '
+    b'"type": "assistant", "is_llm_message": true, "content": "{\\"role\\": \\"assistant\\", \\"content\\": \\"token\\"}", '
+    b'"metadata": "{\\"thread_run_id\\": \\"run-1\\"}", "created_at": "2025-01-01T00:00:00+00:00", "updated_at": "2025-01-01T00:00:00+00:00"}\n\n'
+)
+
+
+class ChunkedBody(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+class StandInTransport(httpx.AsyncBaseTransport):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, stream=ChunkedBody(self.chunks))
+
+
+async def previous_stream_from_url(url: str, client: httpx.AsyncClient):
+    """stream_from_url as it was before the SSE decoder."""
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.strip():
+                yield line.strip()
+
+
+async def read(stream, events: int) -> float:
+    start = time.perf_counter()
+    found = 0
+    async for _ in stream:
+        found += 1
+    elapsed = time.perf_counter() - start
+    assert found == events, (found, events)
+    return elapsed
+
+
+def report(name: str, elapsed: float, events: int) -> float:
+    rate = events / elapsed
+    print(f"{name:<12} {elapsed:7.2f}s  {rate:>12,.0f} events/sec")
+    return rate
+
+
+async def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 16 * 1024
+    body = LINE * events
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    print(f"{events:,} events, {len(body) / 2**20:.0f} MiB in {chunk_size:,}-byte chunks")
+    url = "http://stand-in/stream"
+    previous, current = [], []
+    async with httpx.AsyncClient(transport=StandInTransport(chunks)) as client:
+        # Interleaved so both see the same machine conditions
+        for _ in range(3):
+            previous.append(await read(previous_stream_from_url(url, client), events))
+            current.append(await read(stream_from_url(url, client=client), events))
+    before = report("aiter_lines", min(previous), events)
+    after = report("sse", min(current), events)
+    print(f"speedup      {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+Benchmark: agent-run streams through a fresh client per stream vs. the pooled client.
+
+Starts a local stand-in for the agent-run stream endpoint that counts accepted
+connections. Every accepted connection is one TCP (and, against the real API,
+one TLS) handshake.
+
+Usage:
+    python benchmarks/bench_stream_pool.py [streams] [concurrency]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from a2abase.api.transport import create_transport
+from a2abase.api.utils import stream_from_url
+
+LINE = b'data: {"message_id": "m", "thread_id": "t", "type": "assistant", "is_llm_message": true, "content": "{}", "metadata": "{}", "created_at": "", "updated_at": ""}\n\n'
+BODY = LINE * 20
+
+
+class StandInServer:
+    def __init__(self):
+        self.connections = 0
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                if not head:
+                    break
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                    b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def run_streams(url: str, streams: int, concurrency: int, client: httpx.AsyncClient | None) -> int:
+    semaphore = asyncio.Semaphore(concurrency)
+    lines = 0
+
+    async def one():
+        nonlocal lines
+        async with semaphore:
+            async for _ in stream_from_url(url, client=client):
+                lines += 1
+
+    await asyncio.gather(*(one() for _ in range(streams)))
+    return lines
+
+
+async def main(streams: int = 500, concurrency: int = 50):
+    for label, pooled in (("fresh client per stream", False), ("pooled client", True)):
+        server = StandInServer()
+        base_url = await server.start()
+        url = f"{base_url}/agent-run/bench/stream"
+        client = httpx.AsyncClient(transport=create_transport()) if pooled else None
+        start = time.perf_counter()
+        lines = await run_streams(url, streams, concurrency, client)
+        elapsed = time.perf_counter() - start
+        if client is not None:
+            await client.aclose()
+        await server.stop()
+        print(
+            f"{label:<24} streams={streams} lines={lines} "
+            f"connections={server.connections} elapsed={elapsed:.3f}s "
+            f"streams/s={streams / elapsed:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    asyncio.run(main(*args))
@@ -0,0 +1,177 @@
+"""
+Benchmark: stream line parsing in MessageResponseUtil.to_model.
+
+Parses a synthetic agent-run stream with the previous implementation (strip the
+prefix with str.replace, build a base message, then copy it into the subtype)
+and with the current single-pass one, reporting lines/sec for each.
+
+Usage:
+    python benchmarks/bench_to_model.py [lines]
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+import json
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from a2abase.api.utils import MessageResponseUtil
+
+
+def make_lines(count: int):
+    """A stream mix dominated by assistant chunks, as a real run is."""
+    templates = []
+    for message_type, content in [
+        ("assistant", {"role": "assistant", "content": "The forecast for Paris is sunny with a high of 25C. " * 2}),
+        ("assistant", {"role": "assistant", "content": "Let me check that for you."}),
+        ("assistant", {"role": "assistant", "content": "Done."}),
+        ("status", {"status_type": "assistant_response_start", "thread_run_id": "run-1"}),
+        ("user", {"role": "user", "content": "What is the weather in Paris?"}),
+        ("assistant_response_end", {"usage": {"prompt_tokens": 812, "completion_tokens": 64}}),
+        ("tool", {"role": "tool", "content": '{"result": "sunny 25C"}'}),
+    ]:
+        templates.append("data: " + json.dumps({
+            "message_id": "6f1c1c9e-8a3e-4c8e-9d55-3f0e6f1b2a7d",
+            "thread_id": "0b6a5a42-1f3c-4f2e-8a0d-7c9b6e4d3a21",
+            "type": message_type,
+            "is_llm_message": True,
+            "content": json.dumps(content),
+            "metadata": json.dumps({"thread_run_id": "run-1"}),
+            "created_at": "2025-01-01T00:00:00.000000+00:00",
+            "updated_at": "2025-01-01T00:00:00.000000+00:00",
+            "agent_id": "4c0f8a9e-2b1d-4e6f-9a3c-8d7e6f5a4b3c",
+            "agent_version_id": "9e8d7c6b-5a4f-4e3d-2c1b-0a9f8e7d6c5b",
+        }))
+    return [templates[i % len(templates)] for i in range(count)]
+
+
+# Frozen copy of the eager models the previous to_model built. The live models
+# have since become lazy and intern their ids, so they cannot stand in for "before".
+@dataclass
+class PreviousMessageMetadata:
+    thread_run_id: Optional[str] = None
+
+
+@dataclass
+class PreviousMessageLineResponse:
+    message_id: str
+    thread_id: str
+    type: str
+    is_llm_message: bool
+    content: Dict[str, Any]
+    metadata: PreviousMessageMetadata
+    created_at: str
+    updated_at: str
+    agent_id: Optional[str] = None
+    agent_version_id: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PreviousMessageLineResponse":
+        content_str = data.get("content", "{}")
+        if isinstance(content_str, str):
+            try:
+                content = json.loads(content_str)
+            except (json.JSONDecodeError, TypeError):
+                content = {}
+        else:
+            content = content_str
+        metadata_str = data.get("metadata", "{}")
+        if isinstance(metadata_str, str):
+            try:
+                metadata_dict = json.loads(metadata_str)
+            except (json.JSONDecodeError, TypeError):
+                metadata_dict = {}
+        else:
+            metadata_dict = metadata_str
+        metadata_obj = PreviousMessageMetadata(thread_run_id=metadata_dict.get("thread_run_id"))
+        return cls(
+            message_id=data["message_id"],
+            thread_id=data["thread_id"],
+            type=data["type"],
+            is_llm_message=data["is_llm_message"],
+            content=content,
+            metadata=metadata_obj,
+            created_at=data["created_at"],
+            updated_at=data["updated_at"],
+            agent_id=data.get("agent_id"),
+            agent_version_id=data.get("agent_version_id"),
+        )
+
+
+@dataclass
+class PreviousStatusMessageLineResponse(PreviousMessageLineResponse):
+    type: str = field(init=False, default="status")
+
+
+@dataclass
+class PreviousAssistantResponseEndMessageLineResponse(PreviousMessageLineResponse):
+    type: str = field(init=False, default="assistant_response_end")
+
+
+@dataclass
+class PreviousAssistantMessageLineResponse(PreviousMessageLineResponse):
+    type: str = field(init=False, default="assistant")
+
+
+@dataclass
+class PreviousUserMessageLineResponse(PreviousMessageLineResponse):
+    type: str = field(init=False, default="user")
+
+
+PREVIOUS_CLASSES = {
+    "status": PreviousStatusMessageLineResponse,
+    "assistant_response_end": PreviousAssistantResponseEndMessageLineResponse,
+    "assistant": PreviousAssistantMessageLineResponse,
+    "user": PreviousUserMessageLineResponse,
+}
+
+
+def previous_to_model(json_str: str):
+    """to_model as it was before the single-pass parser."""
+    try:
+        line = json_str.replace("data: ", "")
+        data = json.loads(line)
+        if "status" in data and data["status"] == "completed":
+            return line
+        base_message = PreviousMessageLineResponse.from_dict(data)
+        message_type = data.get("type", "")
+        if message_type in PREVIOUS_CLASSES:
+            return PREVIOUS_CLASSES[message_type](
+                message_id=base_message.message_id,
+                thread_id=base_message.thread_id,
+                is_llm_message=base_message.is_llm_message,
+                content=base_message.content,
+                metadata=base_message.metadata,
+                created_at=base_message.created_at,
+                updated_at=base_message.updated_at,
+                agent_id=base_message.agent_id,
+                agent_version_id=base_message.agent_version_id,
+            )
+        return base_message
+    except json.JSONDecodeError:
+        return None
+
+
+def run(name: str, parse, lines) -> float:
+    start = time.perf_counter()
+    for line in lines:
+        parse(line)
+    elapsed = time.perf_counter() - start
+    rate = len(lines) / elapsed
+    print(f"{name:<10} {elapsed:7.2f}s  {rate:>12,.0f} lines/sec")
+    return rate
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lines = make_lines(count)
+    print(f"{count:,} stream lines")
+    before = run("before", previous_to_model, lines)
+    after = run("after", MessageResponseUtil.to_model, lines)
+    print(f"speedup    {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
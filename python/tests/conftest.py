@@ -0,0 +1,52 @@
+import asyncio
+from types import ModuleType
+from typing import List
+
+import pytest
+
+
+class _AsyncioOnClock:
+    """Stands in for the asyncio module inside a module under test, sleeping on a FakeClock."""
+
+    def __init__(self, clock: "FakeClock"):
+        self._clock = clock
+
+    def __getattr__(self, name: str):
+        return getattr(asyncio, name)
+
+    async def sleep(self, delay: float):
+        await self._clock.sleep(delay)
+
+
+class FakeClock:
+    """Monotonic clock that only moves when a test advances it or code sleeps on it."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch):
+        self._monkeypatch = monkeypatch
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+    async def sleep(self, delay: float):
+        self.sleeps.append(delay)
+        # A real sleep always takes some time, or a wait for a rounding-error sliver never ends
+        self.now += max(delay, 1e-6)
+        # Still yield, so other tasks get to run as they would during a real sleep
+        await asyncio.sleep(0)
+
+    def install(self, module: ModuleType):
+        """Make ``module`` read time from this clock and sleep on it."""
+        if hasattr(module, "time"):
+            self._monkeypatch.setattr(module, "time", self)
+        if hasattr(module, "asyncio"):
+            self._monkeypatch.setattr(module, "asyncio", _AsyncioOnClock(self))
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    return FakeClock(monkeypatch)
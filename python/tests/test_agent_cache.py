@@ -0,0 +1,136 @@
+from typing import List, Optional
+
+import httpx
+
+from a2abase.agent import A2ABaseAgent
+from a2abase.api import cache
+from a2abase.api.agents import AgentResponse, AgentUpdateRequest, AgentsClient, _is_older, parse_timestamp
+
+BASE_URL = "https://api.example.test/api"
+
+
+def agent_row(system_prompt: str = "v1", updated_at: Optional[str] = "2025-01-01T10:00:00Z", **extra) -> dict:
+    return {
+        "agent_id": "a1",
+        "name": "Researcher",
+        "system_prompt": system_prompt,
+        "custom_mcps": [],
+        "agentpress_tools": {},
+        "is_default": False,
+        "created_at": "2025-01-01T00:00:00Z",
+        "updated_at": updated_at,
+        **extra,
+    }
+
+
+def agent(**fields) -> AgentResponse:
+    row = agent_row(**fields)
+    return AgentResponse(**row)
+
+
+def list_body(*rows: dict) -> dict:
+    return {"agents": list(rows), "pagination": {"page": 1, "limit": 20, "total": len(rows), "pages": 1}}
+
+
+def test_parse_timestamp_normalises_offsets_and_precision():
+    assert parse_timestamp("2025-01-01T10:00:00Z") == parse_timestamp("2025-01-01T12:00:00+02:00")
+    assert parse_timestamp("2025-01-01T10:00:00.1234567+00:00") == parse_timestamp("2025-01-01T10:00:00.123456Z")
+    assert parse_timestamp("2025-01-01T10:00:00") == parse_timestamp("2025-01-01T10:00:00+00:00")
+    assert parse_timestamp(None) is None
+    assert parse_timestamp("yesterday") is None
+
+
+def test_is_older_by_timestamp_across_formats():
+    cached = agent(updated_at="2025-01-01T10:00:00.500Z")
+    assert _is_older(agent(updated_at="2025-01-01T12:00:00.4+02:00"), cached)
+    assert not _is_older(agent(updated_at="2025-01-01T10:00:00.500000+00:00"), cached)
+    assert not _is_older(agent(updated_at="2025-01-01T10:00:01Z"), cached)
+
+
+def test_is_older_by_version_without_timestamps():
+    cached = agent(updated_at=None, current_version_id="ver-2", version_count=2)
+    assert _is_older(agent(updated_at=None, current_version_id="ver-1", version_count=1), cached)
+    assert not _is_older(agent(updated_at=None, current_version_id="ver-3", version_count=3), cached)
+    # Same version: nothing to tell them apart, take the one at hand
+    assert not _is_older(agent(updated_at=None, current_version_id="ver-2", version_count=2), cached)
+    # No version signal at all
+    assert not _is_older(agent(updated_at=None), cached)
+
+
+class AgentServer:
+    def __init__(self, responses: List[httpx.Response]):
+        self.responses = responses
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.responses.pop(0)
+
+
+async def test_stale_list_does_not_overwrite_newer_update():
+    server = AgentServer([
+        httpx.Response(200, json=agent_row("v2", "2025-01-01T10:00:05Z")),
+        # List response that left the server before the update
+        httpx.Response(200, json=list_body(agent_row("v1", "2025-01-01T10:00:00.000000+00:00"))),
+    ])
+    client = AgentsClient(BASE_URL, transport=httpx.MockTransport(server))
+    await client.update_agent("a1", AgentUpdateRequest(system_prompt="v2"))
+    listed = await client.get_agents()
+    assert listed.agents[0].system_prompt == "v1"
+    assert (await client.get_agent("a1")).system_prompt == "v2"
+    assert client.name_index.lookup("Researcher").system_prompt == "v2"
+    assert len(server.requests) == 2
+
+
+async def test_newer_list_row_replaces_cached_agent():
+    server = AgentServer([
+        httpx.Response(200, json=agent_row("v1", "2025-01-01T10:00:00Z")),
+        httpx.Response(200, json=list_body(agent_row("v2", "2025-01-01T11:00:00+00:00"))),
+    ])
+    client = AgentsClient(BASE_URL, transport=httpx.MockTransport(server))
+    await client.get_agent("a1")
+    await client.get_agents()
+    assert (await client.get_agent("a1")).system_prompt == "v2"
+
+
+async def test_repeated_reads_served_from_cache():
+    server = AgentServer([httpx.Response(200, json=agent_row())])
+    client = AgentsClient(BASE_URL, transport=httpx.MockTransport(server))
+    await client.get_agent("a1")
+    await client.get_agent("a1")
+    assert len(server.requests) == 1
+
+
+async def test_failed_update_and_delete_invalidate():
+    server = AgentServer([
+        httpx.Response(200, json=agent_row()),
+        httpx.Response(500, json={"detail": "boom"}),
+        httpx.Response(200, json=agent_row("v2")),
+        httpx.Response(200, json={"message": "deleted"}),
+    ])
+    client = AgentsClient(BASE_URL, transport=httpx.MockTransport(server))
+    await client.get_agent("a1")
+    try:
+        await client.update_agent("a1", AgentUpdateRequest(system_prompt="v2"))
+    except httpx.HTTPStatusError:
+        pass
+    # The update may have been applied, so the next read goes to the server
+    assert (await client.get_agent("a1")).system_prompt == "v2"
+    await client.delete_agent("a1")
+    assert client.agent_cache.get("a1") is None
+    assert client.name_index.lookup("Researcher") is None
+
+
+async def test_listed_agent_details_expire_with_the_cache(clock):
+    clock.install(cache)
+    server = AgentServer([
+        httpx.Response(200, json=list_body(agent_row("v1"))),
+        httpx.Response(200, json=agent_row("v2", "2025-01-01T11:00:00Z")),
+    ])
+    client = AgentsClient(BASE_URL, transport=httpx.MockTransport(server), agent_cache_ttl=5.0)
+    [listed] = await A2ABaseAgent(client).list_agents()
+    assert (await listed.get_details()).system_prompt == "v1"
+    assert len(server.requests) == 1
+    clock.advance(5.0)
+    assert (await listed.get_details()).system_prompt == "v2"
+    assert len(server.requests) == 2
@@ -0,0 +1,144 @@
+import json
+from typing import List
+
+import httpx
+import pytest
+
+from a2abase import thread as thread_module
+from a2abase.api.circuit import CircuitBreakerRegistry, CircuitOpenError
+from a2abase.api.routes import match_route
+from a2abase.api.threads import ThreadsClient
+from a2abase.api.transport import A2ABaseTransport
+from a2abase.thread import AgentRun, Thread
+
+BASE_URL = "https://api.example.test/api"
+DONE = b'data: {"type": "status", "status": "completed"}\n\n'
+
+
+def line(message_id, text: str) -> bytes:
+    row = {
+        "message_id": message_id,
+        "thread_id": "t1",
+        "type": "assistant",
+        "is_llm_message": True,
+        "content": json.dumps({"role": "assistant", "content": text}),
+        "metadata": "{}",
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+    }
+    return b"data: " + json.dumps(row).encode() + b"\n\n"
+
+
+def event(i: int) -> bytes:
+    return line(f"m{i}", f"message {i}")
+
+
+# Streamed chunks carry no message ID, only their data tells them apart
+def chunk(text: str) -> bytes:
+    return line(None, text)
+
+
+class DroppingStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self):
+        yield self.body
+        raise httpx.ReadError("connection reset")
+
+
+class RunServer:
+    """Serves one response per connection: a bytes body closes cleanly, a DroppingStream fails."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        body = self.responses.pop(0)
+        if isinstance(body, DroppingStream):
+            return httpx.Response(200, stream=body)
+        return httpx.Response(200, content=body)
+
+
+def summary(message) -> str:
+    if isinstance(message, str):
+        return json.loads(message)["status"]
+    return message.message_id or message.get_content_text()
+
+
+async def stream(server: RunServer, **kwargs) -> List[str]:
+    client = ThreadsClient(BASE_URL, transport=httpx.MockTransport(server))
+    run = AgentRun(Thread(client, "t1"), "r1")
+    return [summary(line) async for line in run.get_stream(**kwargs)]
+
+
+@pytest.fixture(autouse=True)
+def sleeps(clock) -> List[float]:
+    clock.install(thread_module)
+    return clock.sleeps
+
+
+async def test_replay_from_start_is_skipped(sleeps):
+    server = RunServer(
+        DroppingStream(chunk("a") + event(1) + chunk("b")),
+        chunk("a") + event(1) + chunk("b") + chunk("c") + DONE,
+    )
+    assert await stream(server) == ["a", "m1", "b", "c", "completed"]
+    assert sleeps == [3.0]
+
+
+async def test_resumed_stream_loses_nothing():
+    # The server picks up where the dropped connection stopped instead of replaying
+    server = RunServer(
+        DroppingStream(chunk("a") + chunk("b")),
+        chunk("c") + chunk("d") + DONE,
+    )
+    assert await stream(server) == ["a", "b", "c", "d", "completed"]
+
+
+async def test_repeated_data_after_the_replay_is_kept():
+    server = RunServer(
+        DroppingStream(chunk("a")),
+        chunk("a") + chunk("b") + chunk("a") + DONE,
+    )
+    assert await stream(server) == ["a", "b", "a", "completed"]
+
+
+async def test_clean_close_without_status_ends_the_stream(sleeps):
+    server = RunServer(chunk("a"))
+    assert await stream(server) == ["a"]
+    assert len(server.requests) == 1
+    assert sleeps == []
+
+
+async def test_reconnect_on_close_until_the_run_ends():
+    server = RunServer(chunk("a"), chunk("a") + chunk("b") + DONE)
+    assert await stream(server, reconnect_on_close=True) == ["a", "b", "completed"]
+
+
+async def test_reconnect_on_close_gives_up_after_budget():
+    server = RunServer(chunk("a"), chunk("a"), chunk("a"))
+    with pytest.raises(httpx.RemoteProtocolError):
+        await stream(server, reconnect_on_close=True, max_reconnects=2)
+    assert len(server.requests) == 3
+
+
+async def test_transport_errors_raise_after_budget():
+    server = RunServer(DroppingStream(chunk("a")), DroppingStream(chunk("a")))
+    with pytest.raises(httpx.ReadError):
+        await stream(server, max_reconnects=1)
+    assert len(server.requests) == 2
+
+
+async def test_open_circuit_fails_fast(sleeps):
+    registry = CircuitBreakerRegistry(failure_threshold=1)
+    registry.breaker_for(match_route("GET", "/agent-run/r1/stream")).on_failure()
+    server = RunServer(chunk("a") + DONE)
+    client = ThreadsClient(BASE_URL, transport=A2ABaseTransport(httpx.MockTransport(server), circuit_breakers=registry))
+    with pytest.raises(CircuitOpenError):
+        async for _ in AgentRun(Thread(client, "t1"), "r1").get_stream():
+            pass
+    assert server.requests == []
+    assert sleeps == []
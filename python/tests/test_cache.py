@@ -0,0 +1,116 @@
+from typing import List
+
+import httpx
+import pytest
+
+from a2abase.api import cache
+from a2abase.api.cache import TTLCache
+from a2abase.api.threads import ThreadsClient
+from a2abase.thread import Thread
+
+BASE_URL = "https://api.example.test/api"
+
+
+def thread_row(thread_id: str = "t1", updated_at: str = "2025-01-01T00:00:00+00:00") -> dict:
+    return {
+        "thread_id": thread_id,
+        "account_id": "acc",
+        "project_id": None,
+        "metadata": {},
+        "is_public": False,
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": updated_at,
+    }
+
+
+def message_row(thread_id: str = "t1") -> dict:
+    return {
+        "message_id": "m1",
+        "thread_id": thread_id,
+        "type": "user",
+        "is_llm_message": False,
+        "content": "{}",
+        "created_at": "2025-01-01T00:00:01+00:00",
+        "updated_at": "2025-01-01T00:00:01+00:00",
+        "agent_id": None,
+        "agent_version_id": None,
+        "metadata": "{}",
+    }
+
+
+class ThreadServer:
+    def __init__(self):
+        self.gets: List[str] = []
+        self.version = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            self.gets.append(request.url.path)
+            return httpx.Response(200, json=thread_row(updated_at=f"v{self.version}"))
+        self.version += 1
+        return httpx.Response(200, json=message_row())
+
+
+@pytest.fixture
+def cache_clock(clock):
+    clock.install(cache)
+    return clock
+
+
+def test_entries_expire_after_ttl(cache_clock):
+    entries: TTLCache[str] = TTLCache(ttl=5.0)
+    entries.set("a", "value")
+    cache_clock.advance(4.9)
+    assert entries.get("a") == "value"
+    cache_clock.advance(0.1)
+    assert entries.get("a") is None
+    assert "a" not in entries
+
+
+def test_zero_ttl_disables_caching():
+    entries: TTLCache[str] = TTLCache(ttl=0)
+    entries.set("a", "value")
+    assert entries.get("a") is None
+
+
+def test_oldest_entries_evicted_beyond_max_entries():
+    entries: TTLCache[int] = TTLCache(ttl=60.0, max_entries=2)
+    entries.set("a", 1)
+    entries.set("b", 2)
+    # Re-setting moves an entry to the back of the eviction order
+    entries.set("a", 1)
+    entries.set("c", 3)
+    assert "b" not in entries
+    assert entries.get("a") == 1 and entries.get("c") == 3
+
+
+async def test_thread_getters_share_one_fetch(cache_clock):
+    server = ThreadServer()
+    thread = Thread(ThreadsClient(BASE_URL, transport=httpx.MockTransport(server)), "t1")
+    await thread.get_account_id()
+    await thread.get_created_at()
+    await thread.get_updated_at()
+    assert server.gets == ["/api/threads/t1"]
+    cache_clock.advance(10.0)
+    await thread.get_account_id()
+    assert len(server.gets) == 2
+
+
+async def test_writes_invalidate_cached_thread(cache_clock):
+    server = ThreadServer()
+    client = ThreadsClient(BASE_URL, transport=httpx.MockTransport(server))
+    thread = Thread(client, "t1")
+    assert await thread.get_updated_at() == "v0"
+    await thread.add_message("hello")
+    assert await thread.get_updated_at() == "v1"
+    await thread.del_message("m1")
+    assert await thread.get_updated_at() == "v2"
+    assert len(server.gets) == 3
+
+
+async def test_refresh_bypasses_cache(cache_clock):
+    server = ThreadServer()
+    thread = Thread(ThreadsClient(BASE_URL, transport=httpx.MockTransport(server)), "t1")
+    await thread.get_account_id()
+    await thread.refresh()
+    assert len(server.gets) == 2
@@ -0,0 +1,140 @@
+from typing import List
+
+import httpx
+import pytest
+
+from a2abase.api import circuit
+from a2abase.api.circuit import CircuitBreaker, CircuitBreakerRegistry, CircuitEvent, CircuitOpenError, CircuitState
+from a2abase.api.retry import RetryPolicy
+from a2abase.api.routes import match_route
+from a2abase.api.sse import EventSource
+from a2abase.api.transport import A2ABaseTransport
+
+BASE_URL = "https://api.example.test/api"
+CLOSED, OPEN, HALF_OPEN = CircuitState.CLOSED, CircuitState.OPEN, CircuitState.HALF_OPEN
+
+
+@pytest.fixture
+def events() -> List[CircuitEvent]:
+    return []
+
+
+@pytest.fixture
+def breaker(clock, events) -> CircuitBreaker:
+    clock.install(circuit)
+    return CircuitBreaker("GET /agents", failure_threshold=3, recovery_timeout=30.0, listeners=[events.append])
+
+
+def transitions(events: List[CircuitEvent]):
+    return [(event.previous, event.state) for event in events]
+
+
+def test_opens_after_consecutive_failures(breaker, events):
+    breaker.on_failure()
+    breaker.on_failure()
+    breaker.on_success()
+    breaker.on_failure()
+    breaker.on_failure()
+    assert breaker.state == CLOSED
+    breaker.on_failure()
+    assert breaker.state == OPEN
+    assert events == [CircuitEvent("GET /agents", CLOSED, OPEN, 3)]
+
+
+def test_open_fails_fast_until_recovery_timeout(breaker, clock):
+    for _ in range(3):
+        breaker.on_failure()
+    clock.advance(10.0)
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.before_request()
+    assert raised.value.retry_in == pytest.approx(20.0)
+    assert raised.value.route == "GET /agents"
+
+
+def test_half_open_probe_success_closes(breaker, clock, events):
+    for _ in range(3):
+        breaker.on_failure()
+    clock.advance(30.0)
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
+    # Only half_open_max_calls probes at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.on_success()
+    assert breaker.state == CLOSED
+    assert transitions(events) == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)]
+    breaker.before_request()
+
+
+def test_half_open_probe_failure_reopens(breaker, clock, events):
+    for _ in range(3):
+        breaker.on_failure()
+    clock.advance(30.0)
+    breaker.before_request()
+    breaker.on_failure()
+    assert breaker.state == OPEN
+    assert transitions(events) == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, OPEN)]
+    # A fresh recovery timeout starts from the failed probe
+    clock.advance(29.0)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_abandoned_probe_frees_its_slot(breaker, clock):
+    for _ in range(3):
+        breaker.on_failure()
+    clock.advance(30.0)
+    breaker.before_request()
+    breaker.on_abandoned()
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
+
+
+def test_registry_shares_listeners_across_routes(clock):
+    clock.install(circuit)
+    registry = CircuitBreakerRegistry(failure_threshold=1)
+    first = registry.breaker_for(match_route("GET", "/agents"))
+    events: List[CircuitEvent] = []
+    # Added after the first breaker exists and still reaches it
+    registry.add_listener(events.append)
+    assert registry.breaker_for(match_route("GET", "/agents")) is first
+    first.on_failure()
+    registry.breaker_for(match_route("GET", "/threads/t1")).on_failure()
+    assert [event.route for event in events] == ["GET /agents", "GET /threads/{thread_id}"]
+    assert registry.states() == {"GET /agents": OPEN, "GET /threads/{thread_id}": OPEN}
+
+
+async def test_transport_opens_on_5xx_and_stops_sending(clock):
+    clock.install(circuit)
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        return httpx.Response(503)
+
+    registry = CircuitBreakerRegistry(failure_threshold=2)
+    transport = A2ABaseTransport(httpx.MockTransport(handler), retry=RetryPolicy(max_attempts=5), circuit_breakers=registry)
+    async with httpx.AsyncClient(base_url=BASE_URL, transport=transport) as client:
+        # The second 503 opens the circuit and the third attempt is refused without a retry
+        with pytest.raises(CircuitOpenError):
+            await client.get("/agents")
+    assert len(sent) == 2
+
+
+def test_circuit_open_is_not_a_transport_error():
+    # Reconnect loops catch TransportError, an open circuit must get past them
+    assert not issubclass(CircuitOpenError, httpx.TransportError)
+    assert issubclass(CircuitOpenError, httpx.HTTPError)
+
+
+async def test_event_source_does_not_reconnect_into_open_circuit(clock):
+    clock.install(circuit)
+    registry = CircuitBreakerRegistry(failure_threshold=1)
+    registry.breaker_for(match_route("GET", "/agent-run/r1/stream")).on_failure()
+    transport = A2ABaseTransport(httpx.MockTransport(lambda request: httpx.Response(200)), circuit_breakers=registry)
+    async with httpx.AsyncClient(base_url=BASE_URL, transport=transport) as client:
+        source = EventSource(client, "/agent-run/r1/stream", last_event_id="7")
+        with pytest.raises(CircuitOpenError):
+            async for _ in source:
+                pass
+    assert source.reconnects == 0
@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+import pytest
+
+from a2abase.api.concurrency import AdaptiveConcurrencyLimiter
+from a2abase.api.retry import RetryPolicy
+from a2abase.api.routes import match_route
+from a2abase.api.transport import A2ABaseTransport
+
+
+async def test_limit_grows_by_about_one_per_limit_of_successes():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+    # +1/limit each, so the step shrinks slightly as the limit rises
+    for _ in range(5):
+        await limiter.acquire()
+        limiter.release(0.1)
+    assert limiter.limit == 5
+    assert limiter.in_flight == 0
+
+
+async def test_limit_capped_at_max():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+    for _ in range(50):
+        await limiter.acquire()
+        limiter.release(0.1)
+    assert limiter.limit == 3
+
+
+async def test_drop_cuts_limit_down_to_min():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, min_limit=2, backoff_ratio=0.5)
+    await limiter.acquire()
+    limiter.release(None, dropped=True)
+    assert limiter.limit == 5
+    for _ in range(5):
+        await limiter.acquire()
+        limiter.release(None, dropped=True)
+    assert limiter.limit == 2
+
+
+async def test_latency_spike_cuts_limit():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5, latency_tolerance=2.0)
+    await limiter.acquire()
+    limiter.release(0.1)
+    await limiter.acquire()
+    limiter.release(1.0)
+    assert limiter.limit == 5
+    # A spike does not move the baseline
+    assert limiter.baseline_latency == pytest.approx(0.1)
+
+
+async def test_waiters_served_in_arrival_order():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    await limiter.acquire()
+    order = []
+
+    async def worker(name: str):
+        await limiter.acquire()
+        order.append(name)
+
+    tasks = [asyncio.create_task(worker(name)) for name in "abc"]
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 3
+    for _ in range(3):
+        limiter.release(None)
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == ["a", "b", "c"]
+
+
+async def test_cancelled_waiter_leaves_queue():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 1
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert limiter.queue_depth == 0
+    limiter.release(None)
+    assert limiter.in_flight == 0
+
+
+async def test_slot_handed_to_cancelled_waiter_passes_on():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    await limiter.acquire()
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    # The slot goes to the first waiter, which is cancelled before it resumes
+    limiter.release(None)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    await second
+    assert limiter.in_flight == 1
+    assert limiter.queue_depth == 0
+
+
+async def test_transport_limits_only_listed_routes_and_cuts_on_503():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, backoff_ratio=0.5)
+    assert limiter.applies_to(match_route("POST", "/thread/t1/agent/start"))
+    assert not limiter.applies_to(match_route("GET", "/agents"))
+    inner = httpx.MockTransport(lambda request: httpx.Response(503))
+    transport = A2ABaseTransport(inner, retry=RetryPolicy(max_attempts=1), concurrency_limiter=limiter)
+    async with httpx.AsyncClient(base_url="https://api.example.test/api", transport=transport) as client:
+        await client.get("/agents")
+        assert limiter.limit == 10
+        await client.post("/thread/t1/agent/start")
+    assert limiter.limit == 5
+    assert limiter.in_flight == 0
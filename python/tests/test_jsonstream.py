@@ -0,0 +1,120 @@
+import json
+import random
+from typing import Any, AsyncIterator, Dict, List
+
+import httpx
+import pytest
+
+from a2abase.api.agents import AgentsClient
+from a2abase.api.jsonstream import JSONArrayStream, iter_json_array
+from a2abase.api.threads import ThreadsClient
+
+BASE_URL = "https://api.example.test/api"
+
+THREAD_ROW = {
+    "thread_id": "t2",
+    "account_id": "acc",
+    "project_id": None,
+    "metadata": {},
+    "is_public": False,
+    "created_at": "2025-01-01T00:00:00+00:00",
+    "updated_at": "2025-01-01T00:00:00+00:00",
+}
+
+AGENT_ROW = {
+    "agent_id": "a1",
+    "name": "Researcher",
+    "system_prompt": "v1",
+    "custom_mcps": [],
+    "agentpress_tools": {},
+    "is_default": False,
+    "created_at": "2025-01-01T00:00:00Z",
+    "updated_at": "2025-01-01T00:00:00Z",
+}
+
+ELEMENTS: List[Any] = [
+    {},
+    [],
+    {"a": [1, 2, {"b": None}], "c": {"d": [[], {}]}},
+    "plain",
+    'quote " backslash \\ slash / tab \t newline \n',
+    "unicode é ✓ 𝄞",
+    "",
+    0,
+    -12.5e-3,
+    True,
+    False,
+    None,
+    {"nested": "}]{[,:", "escaped": "\\\""},
+]
+
+
+def split_randomly(body: bytes, rng: random.Random) -> List[bytes]:
+    chunks = []
+    pos = 0
+    while pos < len(body):
+        size = rng.randint(1, 8)
+        chunks.append(body[pos:pos + size])
+        pos += size
+    return chunks
+
+
+async def aiter(chunks: List[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def bodies(rng: random.Random):
+    for ensure_ascii in (True, False):
+        for indent in (None, 2):
+            for items in ([], ELEMENTS, rng.sample(ELEMENTS, 5)):
+                doc = {"before": {"x": [1, "]"]}, "items": items, "pagination": {"page": 1, "pages": 3}}
+                yield doc, json.dumps(doc, ensure_ascii=ensure_ascii, indent=indent).encode()
+
+
+@pytest.mark.parametrize("seed", range(20))
+async def test_random_chunk_boundaries(seed):
+    rng = random.Random(seed)
+    for doc, body in bodies(rng):
+        fields: Dict[str, Any] = {}
+        got = [e async for e in iter_json_array(aiter(split_randomly(body, rng)), "items", fields)]
+        assert got == doc["items"]
+        assert fields == {"before": doc["before"], "pagination": doc["pagination"]}
+
+
+def test_byte_at_a_time():
+    body = json.dumps({"items": ELEMENTS, "total": 13}, ensure_ascii=False).encode()
+    parser = JSONArrayStream("items")
+    got = []
+    for i in range(len(body)):
+        got.extend(parser.feed(body[i:i + 1]))
+    assert parser.done
+    assert got == ELEMENTS
+    assert parser.fields == {"total": 13}
+
+
+async def test_truncated_body_raises():
+    body = json.dumps({"items": ELEMENTS}).encode()
+    with pytest.raises(json.JSONDecodeError):
+        async for _ in iter_json_array(aiter([body[:-1]]), "items"):
+            pass
+
+
+async def test_stream_threads_reports_pagination():
+    pagination = {"page": 2, "limit": 1, "total": 3, "pages": 3}
+    body = {"threads": [THREAD_ROW], "pagination": pagination}
+    client = ThreadsClient(BASE_URL, transport=httpx.MockTransport(lambda request: httpx.Response(200, json=body)))
+    fields: Dict[str, Any] = {}
+    threads = [t async for t in client.stream_threads(page=2, limit=1, fields=fields)]
+    assert [t.thread_id for t in threads] == ["t2"]
+    assert fields["pagination"] == pagination
+
+
+async def test_stream_agents_reports_pagination():
+    pagination = {"page": 1, "limit": 20, "total": 1, "pages": 1}
+    body = {"agents": [AGENT_ROW], "pagination": pagination}
+    client = AgentsClient(BASE_URL, transport=httpx.MockTransport(lambda request: httpx.Response(200, json=body)))
+    fields: Dict[str, Any] = {}
+    agents = [a async for a in client.stream_agents(fields=fields)]
+    assert [a.agent_id for a in agents] == ["a1"]
+    assert fields["pagination"] == pagination
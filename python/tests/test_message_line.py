@@ -0,0 +1,47 @@
+import dataclasses
+import json
+
+from a2abase.api.threads import (
+    AssistantMessageLineResponse,
+    MessageLineResponse,
+    MessageMetadata,
+    _UNDECODED,
+)
+
+ROW = {
+    "message_id": "m1",
+    "thread_id": "t1",
+    "type": "assistant",
+    "is_llm_message": True,
+    "content": json.dumps({"role": "assistant", "content": "hello"}),
+    "metadata": json.dumps({"thread_run_id": "run1"}),
+    "created_at": "2025-01-01T00:00:00+00:00",
+    "updated_at": "2025-01-01T00:00:00+00:00",
+}
+
+DECODED = {
+    **ROW,
+    "content": {"role": "assistant", "content": "hello"},
+    "metadata": {"thread_run_id": "run1"},
+    "agent_id": None,
+    "agent_version_id": None,
+}
+
+
+def test_dataclass_helpers_work_on_lazy_messages():
+    message = MessageLineResponse.from_dict(ROW)
+    assert dataclasses.is_dataclass(message)
+    assert [f.name for f in dataclasses.fields(message)] == list(DECODED)
+    assert message._content is _UNDECODED
+    assert dataclasses.asdict(message) == DECODED
+    assert dataclasses.astuple(message)[4] == DECODED["content"]
+
+
+def test_replace_keeps_the_subtype():
+    message = AssistantMessageLineResponse.from_dict(ROW)
+    changed = dataclasses.replace(message, content={"content": "bye"})
+    assert type(changed) is AssistantMessageLineResponse
+    assert changed.type == "assistant"
+    assert changed.get_content_text() == "bye"
+    assert changed.metadata == MessageMetadata(thread_run_id="run1")
+    assert dataclasses.replace(changed, content=message.content) == message
@@ -0,0 +1,109 @@
+import itertools
+from typing import List
+
+import httpx
+import pytest
+
+from a2abase.api.threads import Message, ThreadsClient, _messages_after
+
+BASE_URL = "https://api.example.test/api"
+COUNT = 250
+
+
+def message_row(i: int) -> dict:
+    return {
+        "message_id": f"m{i:03}",
+        "thread_id": "t1",
+        "type": "user",
+        "is_llm_message": False,
+        "content": "{}",
+        # Two messages per second, so ties on created_at are common
+        "created_at": f"2025-01-01T00:{i // 120:02}:{i // 2 % 60:02}+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+        "agent_id": None,
+        "agent_version_id": None,
+        "metadata": "{}",
+    }
+
+
+ROWS = [message_row(i) for i in range(COUNT)]
+
+
+class MessageServer:
+    """Stand-in for the messages endpoint, each flag switching one server feature on."""
+
+    def __init__(self, honour_limit: bool, honour_since: bool, cursors: bool):
+        self.honour_limit = honour_limit
+        self.honour_since = honour_since
+        self.cursors = cursors
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        params = request.url.params
+        rows = ROWS if params.get("order", "desc") == "asc" else ROWS[::-1]
+        if self.honour_since and "since_message_id" in params:
+            after = int(params["since_message_id"][1:])
+            rows = [r for r in rows if int(r["message_id"][1:]) > after]
+        start = int(params["cursor"]) if self.cursors and "cursor" in params else 0
+        end = start + int(params["limit"]) if self.honour_limit and "limit" in params else len(rows)
+        body = {"messages": rows[start:end]}
+        if self.cursors and end < len(rows):
+            body["next_cursor"] = str(end)
+        return httpx.Response(200, json=body)
+
+
+def ids(order: str, after: int = -1) -> List[str]:
+    wanted = [f"m{i:03}" for i in range(after + 1, COUNT)]
+    return wanted if order == "asc" else wanted[::-1]
+
+
+SERVERS = list(itertools.product([False, True], repeat=3))
+
+
+@pytest.mark.parametrize("honour_limit,honour_since,cursors", SERVERS)
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_iterates_whole_history(order, honour_limit, honour_since, cursors):
+    server = MessageServer(honour_limit, honour_since, cursors)
+    client = ThreadsClient(BASE_URL, transport=httpx.MockTransport(server))
+    got = [m.message_id async for m in client.iter_thread_messages("t1", order=order, page_size=100)]
+    assert got == ids(order)
+    assert len(server.requests) <= 4
+
+
+@pytest.mark.parametrize("honour_limit,honour_since,cursors", SERVERS)
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_iterates_messages_after(order, honour_limit, honour_since, cursors):
+    server = MessageServer(honour_limit, honour_since, cursors)
+    client = ThreadsClient(BASE_URL, transport=httpx.MockTransport(server))
+    since = ROWS[101]
+    got = [
+        m.message_id
+        async for m in client.iter_thread_messages(
+            "t1", order=order, page_size=100, since_message_id=since["message_id"], since_created_at=since["created_at"]
+        )
+    ]
+    assert got == ids(order, after=101)
+
+
+def messages(*indexes: int) -> List[Message]:
+    return [Message(**message_row(i)) for i in indexes]
+
+
+def message_ids(result: List[Message]) -> List[str]:
+    return [m.message_id for m in result]
+
+
+def test_messages_after_keeps_messages_sharing_the_timestamp():
+    # m004 and m005 share a second; only m005 was not seen
+    assert message_ids(_messages_after(messages(3, 4, 5, 6), "asc", "m004", ROWS[4]["created_at"])) == ["m005", "m006"]
+    assert message_ids(_messages_after(messages(6, 5, 4, 3), "desc", "m004", ROWS[4]["created_at"])) == ["m006", "m005"]
+
+
+def test_messages_after_timestamp_only_is_strict():
+    assert message_ids(_messages_after(messages(3, 4, 5, 6), "asc", None, ROWS[4]["created_at"])) == ["m006"]
+
+
+def test_messages_after_unknown_message_id_keeps_everything_newer():
+    assert message_ids(_messages_after(messages(3, 4, 5), "asc", "m999", None)) == ["m003", "m004", "m005"]
+    assert message_ids(_messages_after(messages(5, 4, 3), "desc", "m004", None)) == ["m005"]
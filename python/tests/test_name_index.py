@@ -0,0 +1,70 @@
+from typing import Dict, List
+
+import httpx
+
+from a2abase.agent import A2ABaseAgent
+from a2abase.api.agents import AgentResponse, AgentsClient, AgentNameIndex
+
+BASE_URL = "https://api.example.test/api"
+
+
+def agent_row(agent_id: str, name: str, updated_at: str) -> Dict:
+    return {
+        "agent_id": agent_id,
+        "name": name,
+        "system_prompt": "",
+        "custom_mcps": [],
+        "agentpress_tools": {},
+        "is_default": False,
+        "created_at": "2025-01-01T00:00:00Z",
+        "updated_at": updated_at,
+    }
+
+
+class PagedAgents:
+    """Serves fixed pages of GET /agents and records which pages were asked for."""
+
+    def __init__(self, pages: List[List[Dict]]):
+        self.pages = pages
+        self.requested: List[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        self.requested.append(page)
+        pagination = {"page": page, "limit": 100, "total": sum(map(len, self.pages)), "pages": len(self.pages)}
+        return httpx.Response(200, json={"agents": self.pages[page - 1], "pagination": pagination})
+
+
+def test_duplicate_names_resolved_by_parsed_updated_at():
+    index = AgentNameIndex()
+    # 10:00Z written with an offset sorts after 11:00Z as a string
+    index.add(AgentResponse(**agent_row("a1", "Researcher", "2025-01-01T12:00:00+02:00")))
+    index.add(AgentResponse(**agent_row("a2", "Researcher", "2025-01-01T11:00:00Z")))
+    assert index.lookup("Researcher").agent_id == "a2"
+
+
+async def test_find_by_name_walks_every_page_once():
+    server = PagedAgents([[agent_row("a1", "One", "2025-01-02T00:00:00Z")], [agent_row("a2", "Two", "2025-01-01T00:00:00Z")]])
+    agents = A2ABaseAgent(AgentsClient(BASE_URL, transport=httpx.MockTransport(server)))
+    assert (await agents.find_by_name("Two"))._agent_id == "a2"
+    assert (await agents.find_by_name("One"))._agent_id == "a1"
+    assert server.requested == [1, 2]
+
+
+async def test_incremental_sync_stops_at_watermark_across_offsets():
+    server = PagedAgents([
+        [agent_row("a1", "One", "2025-01-01T10:00:00Z")],
+        [agent_row("a2", "Two", "2025-01-01T09:00:00Z")],
+    ])
+    agents = A2ABaseAgent(AgentsClient(BASE_URL, transport=httpx.MockTransport(server)))
+    await agents.refresh_name_index(full=True)
+    server.requested.clear()
+    # Page 1 now reaches 09:00Z written as 11:00+02:00, past the 10:00Z watermark
+    server.pages = [
+        [agent_row("a3", "Three", "2025-01-01T10:30:00.000000+00:00"), agent_row("a2", "Two", "2025-01-01T11:00:00+02:00")],
+        [agent_row("a1", "One", "2025-01-01T10:00:00Z")],
+        [],
+    ]
+    await agents.refresh_name_index()
+    assert server.requested == [1]
+    assert (await agents.find_by_name("Three"))._agent_id == "a3"
@@ -0,0 +1,100 @@
+import httpx
+import pytest
+
+from a2abase.api import ratelimit
+from a2abase.api.ratelimit import RateLimit, RateLimiter, TokenBucket
+from a2abase.api.retry import RetryPolicy
+from a2abase.api.routes import match_route
+from a2abase.api.transport import A2ABaseTransport
+
+BASE_URL = "https://api.example.test/api"
+
+
+@pytest.fixture
+def bucket_clock(clock):
+    clock.install(ratelimit)
+    return clock
+
+
+async def test_burst_then_refill_at_rate(bucket_clock):
+    bucket = TokenBucket(rate=10.0, burst=3.0)
+    for _ in range(3):
+        await bucket.acquire()
+    assert bucket_clock.sleeps == []
+    await bucket.acquire()
+    # Empty bucket: wait one token's worth at 10/s
+    assert bucket_clock.sleeps == [pytest.approx(0.1)]
+
+
+async def test_refill_capped_at_burst(bucket_clock):
+    bucket = TokenBucket(rate=10.0, burst=2.0)
+    await bucket.acquire()
+    await bucket.acquire()
+    bucket_clock.advance(60.0)
+    await bucket.acquire()
+    await bucket.acquire()
+    assert bucket_clock.sleeps == []
+    await bucket.acquire()
+    assert sum(bucket_clock.sleeps) == pytest.approx(0.1)
+
+
+async def test_throttled_halves_rate_and_pauses_for_retry_after(bucket_clock):
+    bucket = TokenBucket(rate=10.0, burst=5.0)
+    bucket.on_throttled(retry_after=2.0)
+    assert bucket.rate == 5.0
+    start = bucket_clock.now
+    await bucket.acquire()
+    # Held off for Retry-After, then for a token at the reduced rate
+    assert bucket_clock.now - start >= 2.0
+    assert bucket_clock.sleeps[0] == pytest.approx(2.0)
+
+
+async def test_rate_never_drops_below_min_and_recovers_on_success(bucket_clock):
+    bucket = TokenBucket(rate=10.0, min_rate=1.0, increase_step=2.0)
+    for _ in range(10):
+        bucket.on_throttled()
+    assert bucket.rate == 1.0
+    for _ in range(3):
+        bucket.on_success()
+    assert bucket.rate == 7.0
+    for _ in range(3):
+        bucket.on_success()
+    assert bucket.rate == 10.0
+
+
+def test_buckets_resolve_by_route_then_method_then_default():
+    limiter = RateLimiter(
+        default=RateLimit(rate=50.0),
+        routes={"POST /thread/{thread_id}/agent/start": RateLimit(rate=1.0), "GET": RateLimit(rate=20.0)},
+    )
+    start = limiter.bucket_for(match_route("POST", "/thread/t1/agent/start"))
+    assert start is limiter.bucket_for(match_route("POST", "/thread/t2/agent/start"))
+    assert start.rate == 1.0
+    assert limiter.bucket_for(match_route("GET", "/agents")).rate == 20.0
+    assert limiter.bucket_for(match_route("DELETE", "/agents/a1")).rate == 50.0
+    assert RateLimiter().bucket_for(match_route("GET", "/agents")) is None
+
+
+async def test_429_through_transport_backs_off_route_bucket(bucket_clock):
+    responses = [httpx.Response(429, headers={"Retry-After": "1"}), httpx.Response(200), httpx.Response(500)]
+    limiter = RateLimiter(routes={"GET /agents": RateLimit(rate=8.0, burst=8.0)})
+    inner = httpx.MockTransport(lambda request: responses.pop(0))
+    transport = A2ABaseTransport(inner, retry=RetryPolicy(max_attempts=1), rate_limiter=limiter)
+    async with httpx.AsyncClient(base_url=BASE_URL, transport=transport) as client:
+        await client.get("/agents")
+        assert limiter.current_rates() == {"GET /agents": 4.0}
+        await client.get("/agents")
+        # Held for Retry-After before the second request went out
+        assert bucket_clock.sleeps[0] == pytest.approx(1.0)
+        rate = limiter.current_rates()["GET /agents"]
+        assert rate > 4.0
+        # 5xx is not a throttling signal either way
+        await client.get("/agents")
+        assert limiter.current_rates()["GET /agents"] == rate
+
+
+def test_non_adaptive_limiter_ignores_429():
+    limiter = RateLimiter(default=RateLimit(rate=5.0), adaptive=False)
+    route = match_route("GET", "/agents")
+    limiter.on_response(route, 429, 10.0)
+    assert limiter.bucket_for(route).rate == 5.0
@@ -0,0 +1,152 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import List, Tuple, Union
+
+import httpx
+import pytest
+
+from a2abase.api import transport as transport_module
+from a2abase.api.retry import RetryBudget, RetryPolicy
+from a2abase.api.transport import A2ABaseTransport
+
+BASE_URL = "https://api.example.test/api"
+
+Fault = Union[int, httpx.Response, Exception]
+
+
+class FaultInjectingTransport(httpx.AsyncBaseTransport):
+    """Answers each request with the next scripted fault: a status code, a response or an exception."""
+
+    def __init__(self, faults: List[Fault], default: int = 200):
+        self.faults = list(faults)
+        self.default = default
+        self.requests: List[httpx.Request] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        fault = self.faults.pop(0) if self.faults else self.default
+        if isinstance(fault, Exception):
+            raise fault
+        if isinstance(fault, httpx.Response):
+            return fault
+        return httpx.Response(fault, json={"attempt": len(self.requests)})
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> List[float]:
+    """Record backoff delays instead of waiting them out."""
+    delays: List[float] = []
+
+    async def fake_sleep(delay: float):
+        delays.append(delay)
+
+    monkeypatch.setattr(transport_module.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def make_client(faults: List[Fault], policy: RetryPolicy) -> Tuple[httpx.AsyncClient, FaultInjectingTransport]:
+    inner = FaultInjectingTransport(faults)
+    client = httpx.AsyncClient(base_url=BASE_URL, transport=A2ABaseTransport(inner, retry=policy))
+    return client, inner
+
+
+async def test_get_retried_on_5xx_until_success(sleeps):
+    client, inner = make_client([503, 502], RetryPolicy(max_attempts=3))
+    async with client:
+        response = await client.get("/agents")
+    assert response.status_code == 200
+    assert len(inner.requests) == 3
+    assert len(sleeps) == 2
+
+
+async def test_get_retried_on_read_error(sleeps):
+    client, inner = make_client([httpx.ReadError("connection reset")], RetryPolicy())
+    async with client:
+        response = await client.get("/threads/t1")
+    assert response.status_code == 200
+    assert len(inner.requests) == 2
+
+
+async def test_post_not_retried_on_503(sleeps):
+    client, inner = make_client([503], RetryPolicy())
+    async with client:
+        response = await client.post("/threads", data={"name": "x"})
+    assert response.status_code == 503
+    assert len(inner.requests) == 1
+    assert sleeps == []
+
+
+async def test_post_not_retried_on_read_error(sleeps):
+    client, inner = make_client([httpx.ReadError("connection reset")], RetryPolicy())
+    async with client:
+        with pytest.raises(httpx.ReadError):
+            await client.post("/threads", data={"name": "x"})
+    assert len(inner.requests) == 1
+
+
+async def test_post_retried_when_never_sent(sleeps):
+    client, inner = make_client([httpx.ConnectError("refused")], RetryPolicy())
+    async with client:
+        response = await client.post("/threads", data={"name": "x"})
+    assert response.status_code == 200
+    assert len(inner.requests) == 2
+
+
+async def test_429_retry_after_seconds(sleeps):
+    throttled = httpx.Response(429, headers={"Retry-After": "7"})
+    client, inner = make_client([throttled], RetryPolicy(max_delay=1.0))
+    async with client:
+        response = await client.post("/threads", data={"name": "x"})
+    assert response.status_code == 200
+    assert len(inner.requests) == 2
+    assert sleeps == [7.0]
+
+
+async def test_429_retry_after_http_date(sleeps):
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    throttled = httpx.Response(429, headers={"Retry-After": format_datetime(when, usegmt=True)})
+    client, inner = make_client([throttled], RetryPolicy(max_delay=1.0))
+    async with client:
+        response = await client.get("/agents")
+    assert response.status_code == 200
+    assert len(sleeps) == 1
+    assert 25.0 <= sleeps[0] <= 30.0
+
+
+async def test_retry_after_beyond_limit_returned_as_is(sleeps):
+    throttled = httpx.Response(429, headers={"Retry-After": "3600"})
+    client, inner = make_client([throttled], RetryPolicy(max_retry_after=60.0))
+    async with client:
+        response = await client.get("/agents")
+    assert response.status_code == 429
+    assert len(inner.requests) == 1
+    assert sleeps == []
+
+
+async def test_attempts_exhausted_returns_last_response(sleeps):
+    client, inner = make_client([500, 500, 500, 500], RetryPolicy(max_attempts=3))
+    async with client:
+        response = await client.get("/agents")
+    assert response.status_code == 500
+    assert len(inner.requests) == 3
+
+
+async def test_budget_exhaustion_stops_retries(sleeps):
+    budget = RetryBudget(ratio=0.0, min_tokens=1.0)
+    client, inner = make_client([503, 503, 503, 503], RetryPolicy(max_attempts=5, budget=budget))
+    async with client:
+        first = await client.get("/agents")
+        second = await client.get("/agents")
+    # The single token pays for one retry of the first request, none are left for the second
+    assert first.status_code == 503
+    assert second.status_code == 503
+    assert len(inner.requests) == 3
+    assert len(sleeps) == 1
+
+
+def test_backoff_stays_within_bounds():
+    policy = RetryPolicy(base_delay=0.1, max_delay=2.0)
+    delay = 0.0
+    for _ in range(50):
+        delay = policy.backoff(delay)
+        assert 0.1 <= delay <= 2.0
@@ -0,0 +1,89 @@
+import asyncio
+
+import httpx
+import pytest
+
+from a2abase.api.agents import AgentsClient
+from a2abase.api.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "result"
+
+    tasks = [asyncio.create_task(flight.do("key", fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert flight.in_flight == 1
+    release.set()
+    assert await asyncio.gather(*tasks) == ["result"] * 5
+    assert calls == 1
+    assert flight.in_flight == 0
+
+
+async def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(flight.do("a", lambda: fetch(1)), flight.do("b", lambda: fetch(2)))
+    assert results == [1, 2]
+
+
+async def test_error_shared_by_every_waiter_and_not_cached():
+    flight = SingleFlight()
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(*(flight.do("key", failing) for _ in range(3)), return_exceptions=True)
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert calls == 1
+    # Finished calls are forgotten, the next one runs again
+    with pytest.raises(ValueError):
+        await flight.do("key", failing)
+    assert calls == 2
+
+
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "result"
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    release.set()
+    assert await second == "result"
+
+
+async def test_identical_concurrent_gets_send_one_request():
+    sent = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"agents": [], "pagination": {"page": 1, "limit": 20, "total": 0, "pages": 0}})
+
+    client = AgentsClient("https://api.example.test/api", transport=httpx.MockTransport(handler))
+    await asyncio.gather(*(client.get_agents() for _ in range(4)), client.get_agents(page=2))
+    # Same query shared, a different page sent on its own
+    assert len(sent) == 2
@@ -0,0 +1,228 @@
+import random
+import re
+from typing import List, Optional, Tuple, Union
+
+import httpx
+import pytest
+
+from a2abase.api import sse
+from a2abase.api.sse import EventSource, SSEDecoder, SSEEvent
+
+URL = "https://api.example.test/api/agent-run/r1/stream"
+
+
+def reference(text: str) -> Tuple[List[SSEEvent], Optional[str], Optional[int]]:
+    """Line-by-line WHATWG event-stream parse, keeping a final event left unterminated like flush() does.
+
+    Returns the events with the last event ID and retry value seen.
+    """
+    if text.startswith("\ufeff"):
+        text = text[1:]
+    events = []
+    data: List[str] = []
+    event = ""
+    last_event_id: Optional[str] = None
+    retry: Optional[int] = None
+    for line in re.split(r"\r\n|\r|\n", text):
+        if not line:
+            if data:
+                events.append(SSEEvent("\n".join(data), event or "message", last_event_id, retry))
+            data, event = [], ""
+            continue
+        if line[0] == ":":
+            continue
+        name, _, value = line.partition(":")
+        if value[:1] == " ":
+            value = value[1:]
+        if name == "data":
+            data.append(value)
+        elif name == "event":
+            event = value
+        elif name == "id" and "\0" not in value:
+            last_event_id = value
+        elif name == "retry" and value.isascii() and value.isdigit():
+            retry = int(value)
+    if data:
+        events.append(SSEEvent("\n".join(data), event or "message", last_event_id, retry))
+    return events, last_event_id, retry
+
+
+def random_body(rng: random.Random) -> str:
+    line_end = rng.choice(["\n", "\r\n", "\r"])
+    lines = []
+    for _ in range(rng.randint(1, 12)):
+        for _ in range(rng.randint(1, 3)):
+            lines.append(rng.choice([
+                f'data: {{"n": {rng.randint(0, 99)}, "s": "é中 ✓"}}',
+                "data:nospace",
+                "data",
+                f"id: {rng.randint(0, 99)}",
+                "event: update",
+                ": keep-alive",
+                "retry: 1500",
+                "unknown: field",
+            ]))
+        lines.append("")
+    text = line_end.join(lines) + line_end
+    if rng.random() < 0.2:
+        text = "\ufeff" + text
+    return text
+
+
+def decode(body: bytes, chunk_sizes: List[int], data_only: bool = False) -> Tuple[List[Union[SSEEvent, str]], SSEDecoder]:
+    """Feed ``body`` in chunks of the given sizes, the remainder as a last chunk."""
+    decoder = SSEDecoder(data_only=data_only)
+    events = []
+    pos = 0
+    for size in chunk_sizes:
+        events += decoder.feed(body[pos:pos + size])
+        pos += size
+    events += decoder.feed(body[pos:])
+    events += decoder.flush()
+    return events, decoder
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_chunk_boundaries_and_line_endings(seed):
+    rng = random.Random(seed)
+    for _ in range(50):
+        text = random_body(rng)
+        body = text.encode()
+        expected, last_event_id, retry = reference(text)
+        sizes = [rng.randint(1, 16) for _ in range(len(body) // 4)]
+        events, decoder = decode(body, sizes)
+        assert events == expected, text
+        assert (decoder.last_event_id, decoder.retry) == (last_event_id, retry)
+        assert decode(body, sizes, data_only=True)[0] == [e.data for e in expected]
+
+
+@pytest.mark.parametrize("line_end", ["\n", "\r\n", "\r"])
+def test_line_endings(line_end):
+    text = line_end.join(["data: a", "data: b", "", "event: e", "data: c", "", ""])
+    assert decode(text.encode(), [1] * len(text))[0] == [SSEEvent("a\nb"), SSEEvent("c", "e")]
+
+
+def test_crlf_split_between_chunks():
+    # A chunk ending in \r may be the first half of \r\n, which must not end the event early
+    decoder = SSEDecoder()
+    assert decoder.feed(b"data: a\r") == []
+    assert decoder.feed(b"\ndata: b\r\n\r") == []
+    assert decoder.feed(b"\n") == [SSEEvent("a\nb")]
+
+
+def test_leading_bom_stripped_once():
+    body = "\ufeffdata: a\n\n\ufeffdata: b\n\n".encode()
+    # Only the stream's first character is a byte order mark, the second one starts an unknown field
+    assert decode(body, [1, 2])[0] == [SSEEvent("a")]
+
+
+def test_id_and_retry_tracked():
+    events, decoder = decode(b"id: 7\nretry: 2500\ndata: a\n\nid: bad\0id\ndata: b\n\nretry: soon\n\n", [])
+    assert events == [SSEEvent("a", id="7", retry=2500), SSEEvent("b", id="7", retry=2500)]
+    assert decoder.last_event_id == "7"
+    assert decoder.retry == 2500
+
+
+def test_data_only_returns_strings_and_still_tracks_id():
+    events, decoder = decode(b"id: 3\ndata: a\ndata: b\n\ndata: c\n\n", [5, 9], data_only=True)
+    assert events == ["a\nb", "c"]
+    assert decoder.last_event_id == "3"
+
+
+def test_unterminated_final_event_kept():
+    assert decode(b"data: a\n\ndata: b", [])[0] == [SSEEvent("a"), SSEEvent("b")]
+
+
+class DroppingStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def __aiter__(self):
+        yield self.body
+        raise httpx.ReadError("connection reset")
+
+
+class ResumingServer:
+    def __init__(self):
+        self.requests: List[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if len(self.requests) == 1:
+            return httpx.Response(200, stream=DroppingStream(b"retry: 250\nid: 1\ndata: a\n\n"))
+        after = int(request.headers["Last-Event-ID"])
+        return httpx.Response(200, content=f"id: {after + 1}\ndata: b\n\n".encode())
+
+
+@pytest.mark.parametrize("data_only", [False, True])
+async def test_event_source_resumes_with_last_event_id(clock, data_only):
+    clock.install(sse)
+    server = ResumingServer()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+        source = EventSource(client, URL)
+        stream = source.data() if data_only else source
+        events = [e async for e in stream]
+    if data_only:
+        assert events == ["a", "b"]
+    else:
+        assert events == [SSEEvent("a", id="1", retry=250), SSEEvent("b", id="2")]
+    assert "Last-Event-ID" not in server.requests[0].headers
+    assert server.requests[1].headers["Last-Event-ID"] == "1"
+    assert clock.sleeps == [0.25]
+    assert source.reconnects == 1
+    assert source.last_event_id == "2"
+
+
+async def test_event_source_without_event_id_does_not_reconnect(clock):
+    clock.install(sse)
+
+    def server(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=DroppingStream(b"data: a\n\n"))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+        received = []
+        with pytest.raises(httpx.ReadError):
+            async for event in EventSource(client, URL):
+                received.append(event.data)
+    assert received == ["a"]
+    assert clock.sleeps == []
+
+
+EVENT_PIECES = [
+    "data: {}\n\n",
+    "data: héllo ✓\n\n",
+    "data: a\ndata: b\n\n",
+    "event: e\ndata: x\n\n",
+    "id: {}\n\n",
+    "retry: 5\n\n",
+    ": comment\n\n",
+    "data:\n\n",
+    "data:nospace\n\n",
+    "data: \x00\n\n",
+    "\n\n",
+]
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("data_only", [False, True])
+def test_fast_path_matches_general_path(seed, data_only):
+    """Chunks of whole events take the fast path when they hold only single-line data events;
+    fed one byte at a time the same bytes go through the general path."""
+    rng = random.Random(seed)
+    for _ in range(100):
+        pieces = [rng.choice(EVENT_PIECES).replace("{}", str(rng.randint(0, 99))) for _ in range(rng.randint(1, 10))]
+        if rng.random() < 0.1:
+            pieces[0] = "\ufeff" + pieces[0]
+        body = "".join(pieces).encode()
+        general, general_decoder = decode(body, [1] * len(body), data_only)
+        aligned = SSEDecoder(data_only=data_only)
+        events = []
+        i = 0
+        while i < len(pieces):
+            # One to three whole events per chunk, as a token-rate stream delivers them
+            n = rng.randint(1, 3)
+            events += aligned.feed("".join(pieces[i:i + n]).encode())
+            i += n
+        events += aligned.flush()
+        assert events == general, pieces
+        assert (aligned.last_event_id, aligned.retry) == (general_decoder.last_event_id, general_decoder.retry)
@@ -0,0 +1,105 @@
+import json
+from typing import List
+
+import httpx
+import pytest
+
+from a2abase.api.threads import ThreadsClient, _UNDECODED
+from a2abase.store import LocalStore
+from a2abase.thread import AgentRun, Thread
+
+BASE_URL = "https://api.example.test/api"
+
+THREAD_ROW = {
+    "thread_id": "t1",
+    "account_id": "acc",
+    "project_id": None,
+    "metadata": {},
+    "is_public": False,
+    "created_at": "2025-01-01T00:00:00+00:00",
+    "updated_at": "2025-01-01T00:00:00+00:00",
+}
+
+
+def message_row(i: int, created_at: str) -> dict:
+    return {
+        "message_id": f"m{i}",
+        "thread_id": "t1",
+        "type": "assistant",
+        "is_llm_message": True,
+        "content": json.dumps({"role": "assistant", "content": f"reply {i}"}),
+        "created_at": created_at,
+        "updated_at": created_at,
+        "agent_id": None,
+        "agent_version_id": None,
+        "metadata": json.dumps({"thread_run_id": "run1"}),
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalStore(str(tmp_path / "mirror.db"))
+
+
+async def test_since_message_id_keeps_messages_sharing_its_timestamp(store):
+    rows = [
+        message_row(1, "2025-01-01T00:00:01+00:00"),
+        message_row(2, "2025-01-01T00:00:02+00:00"),
+        # Same second as m2, written after it
+        message_row(3, "2025-01-01T00:00:02+00:00"),
+        message_row(4, "2025-01-01T00:00:03+00:00"),
+    ]
+
+    def server(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/messages"):
+            return httpx.Response(200, json={"messages": rows[::-1]})
+        return httpx.Response(200, json=THREAD_ROW)
+
+    thread = Thread(ThreadsClient(BASE_URL, transport=httpx.MockTransport(server)), "t1", store=store)
+    remote = Thread(thread._client, "t1")
+    since = {"since_message_id": "m2", "since_created_at": rows[1]["created_at"]}
+    got = [m.message_id for m in await thread.get_messages(**since)]
+    assert got == [m.message_id for m in await remote.get_messages(**since)]
+    assert got == ["m4", "m3"]
+
+
+def sse_body(rows: List[dict]) -> bytes:
+    events = [b"data: " + json.dumps(row).encode() + b"\n\n" for row in rows]
+    events.append(b'data: {"type": "status", "status": "completed"}\n\n')
+    return b"".join(events)
+
+
+async def test_stream_messages_mirrored_in_batches(store, monkeypatch):
+    rows = [message_row(i, f"2025-01-01T00:01:{i:02}+00:00") for i in range(7)]
+    client = ThreadsClient(BASE_URL, transport=httpx.MockTransport(lambda request: httpx.Response(200, content=sse_body(rows))))
+    batches: List[int] = []
+    record = store.record_stream_messages
+
+    def counting(messages):
+        batches.append(len(messages))
+        record(messages)
+
+    monkeypatch.setattr(store, "record_stream_messages", counting)
+    monkeypatch.setattr(AgentRun, "STORE_BATCH_SIZE", 3)
+    run = AgentRun(Thread(client, "t1", store=store), "run1")
+    streamed = [m async for m in run.get_stream()]
+
+    assert batches == [3, 3, 1]
+    # Mirroring does not decode the content of the messages handed to the consumer
+    assert all(m._content is _UNDECODED for m in streamed[:-1])
+    mirrored = store.get_messages("t1", order="asc")
+    assert [m.message_id for m in mirrored] == [r["message_id"] for r in rows]
+    assert json.loads(mirrored[0].content) == {"role": "assistant", "content": "reply 0"}
+    assert [m.message_id for m in store.search("reply")] != []
+
+
+async def test_pending_stream_messages_flushed_when_consumer_stops(store, monkeypatch):
+    rows = [message_row(i, f"2025-01-01T00:01:{i:02}+00:00") for i in range(5)]
+    client = ThreadsClient(BASE_URL, transport=httpx.MockTransport(lambda request: httpx.Response(200, content=sse_body(rows))))
+    run = AgentRun(Thread(client, "t1", store=store), "run1")
+    stream = run.get_stream()
+    async for message in stream:
+        if message.message_id == "m1":
+            break
+    await stream.aclose()
+    assert [m.message_id for m in store.get_messages("t1", order="asc")] == ["m0", "m1"]